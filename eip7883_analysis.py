@@ -7,98 +7,263 @@ Empirical analysis of the impact of EIP-7883 on Ethereum network
 import os
 import sys
 import argparse
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 import warnings
+
+from io_utils import write_text_atomic
+
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
-class ModExpGasCalculator:
-    """Calculate ModExp gas costs according to different EIP specifications"""
+# Bit length of every byte value, used to finish the leading-zero scan
+_BYTE_BITLEN = np.array([v.bit_length() for v in range(256)], dtype=np.int32)
+
+
+def exponent_bitlen_low256(hex_series: pd.Series) -> np.ndarray:
+    """Bit length of the low 256 bits of each hex-encoded exponent"""
+    n = len(hex_series)
+    if n == 0:
+        return np.zeros(0, dtype=np.int32)
+
+    # Left-pad/truncate every exponent to its 32-byte tail and decode in one go
+    digits = hex_series.fillna("").astype(str).str.removeprefix("0x").str.zfill(64).str[-64:]
+    arr = np.frombuffer(bytes.fromhex("".join(digits)), dtype=np.uint8).reshape(n, 32)
+
+    nonzero = arr != 0
+    first = nonzero.argmax(axis=1)
+    bitlen = (31 - first) * 8 + _BYTE_BITLEN[arr[np.arange(n), first]]
+    bitlen[~nonzero.any(axis=1)] = 0
+    return bitlen.astype(np.int32)
+
+
+def _read_block_file(path: Path, columns: Optional[List[str]] = None) -> Tuple[Path, Optional[pa.Table]]:
+    """Read one per-block parquet file, tagging rows with the block number from its name"""
+    try:
+        table = pq.read_table(path, columns=columns)
+    except Exception as e:
+        print(f"WARNING: Failed to load {path.name}: {e}")
+        return path, None
+    block_numbers = np.full(table.num_rows, int(path.stem), dtype=np.int64)
+    return path, table.append_column("block_number", pa.array(block_numbers))
+
+
+def _write_figure_html(figure: go.Figure, path: Path):
+    """Render one chart to a standalone HTML file; module-level so process pools can pickle it"""
+    pio.write_html(figure, path)
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing fixed-window mean from cumulative sums, one value per full window"""
+    cumsum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    return (cumsum[window:] - cumsum[:-window]) / window
+
+
+def _eip2565_cost(base_length: int, exponent_length: int, modulus_length: int, exponent_bytes: str) -> int:
+    """Uncached EIP-2565 formula, see calculate_eip2565_cost"""
+    exponent_int = int(exponent_bytes, 16) if exponent_bytes else 0
+    max_length = max(base_length, modulus_length)
+    words = (max_length + 7) // 8
     
-    @staticmethod
-    def calculate_eip2565_cost(base_length: int, exponent_length: int, modulus_length: int, exponent_bytes: str) -> int:
-        """Calculate gas cost according to EIP-2565 (current mainnet)"""
-        exponent_int = int(exponent_bytes, 16) if exponent_bytes else 0
-        max_length = max(base_length, modulus_length)
-        words = (max_length + 7) // 8
-        
-        # Multiplication complexity
-        if max_length <= 64:
-            multiplication_complexity = words ** 2
-        elif max_length <= 1024:
-            multiplication_complexity = (words ** 2) // 4 + 96 * words - 3072
+    # Multiplication complexity
+    if max_length <= 64:
+        multiplication_complexity = words ** 2
+    elif max_length <= 1024:
+        multiplication_complexity = (words ** 2) // 4 + 96 * words - 3072
+    else:
+        multiplication_complexity = (words ** 2) // 16 + 480 * words - 199680
+        
+    # Iteration count
+    if exponent_length <= 32:
+        if exponent_int == 0:
+            iteration_count = 0
         else:
-            multiplication_complexity = (words ** 2) // 16 + 480 * words - 199680
-            
-        # Iteration count
-        if exponent_length <= 32:
-            if exponent_int == 0:
-                iteration_count = 0
-            else:
-                iteration_count = exponent_int.bit_length() - 1
+            iteration_count = exponent_int.bit_length() - 1
+    else:
+        iteration_count = 8 * (exponent_length - 32)
+        iteration_count += (exponent_int & (2**256 - 1)).bit_length() - 1
+        
+    iteration_count = max(iteration_count, 1)
+    
+    # Final gas cost
+    return max(200, (multiplication_complexity * iteration_count) // 3)
+
+
+def _eip7883_cost(base_length: int, exponent_length: int, modulus_length: int, exponent_bytes: str) -> int:
+    """Uncached EIP-7883 formula, see calculate_eip7883_cost"""
+    exponent_int = int(exponent_bytes, 16) if exponent_bytes else 0
+    max_length = max(base_length, modulus_length)
+    words = (max_length + 7) // 8
+    
+    # Multiplication complexity - NEW FORMULA
+    if max_length <= 32:
+        multiplication_complexity = 16
+    else:
+        multiplication_complexity = 2 * (words ** 2)
+        
+    # Iteration count - UPDATED MULTIPLIER
+    if exponent_length <= 32:
+        if exponent_int == 0:
+            iteration_count = 0
         else:
-            iteration_count = 8 * (exponent_length - 32)
-            iteration_count += (exponent_int & (2**256 - 1)).bit_length() - 1
-            
-        iteration_count = max(iteration_count, 1)
+            iteration_count = exponent_int.bit_length() - 1
+    else:
+        iteration_count = 16 * (exponent_length - 32)  # Changed from 8 to 16
+        iteration_count += (exponent_int & (2**256 - 1)).bit_length() - 1
         
-        # Final gas cost
-        return max(200, (multiplication_complexity * iteration_count) // 3)
+    iteration_count = max(iteration_count, 1)
     
+    # Final gas cost - HIGHER MINIMUM
+    return max(500, (multiplication_complexity * iteration_count) // 3)  # Changed from 200 to 500
+
+
+# Repeated shapes are answered from cache; only exponents up to 32 bytes ("0x" + 64 hex digits)
+# are cached so huge exponent strings never pin memory
+_MAX_CACHED_EXPONENT_LEN = 66
+_eip2565_cost_cached = functools.lru_cache(maxsize=1 << 16)(_eip2565_cost)
+_eip7883_cost_cached = functools.lru_cache(maxsize=1 << 16)(_eip7883_cost)
+
+
+def calculate_eip2565_cost(base_length: int, exponent_length: int, modulus_length: int, exponent_bytes: str) -> int:
+    """Calculate gas cost according to EIP-2565 (current mainnet)"""
+    if exponent_bytes and len(exponent_bytes) > _MAX_CACHED_EXPONENT_LEN:
+        return _eip2565_cost(base_length, exponent_length, modulus_length, exponent_bytes)
+    return _eip2565_cost_cached(base_length, exponent_length, modulus_length, exponent_bytes)
+
+
+def calculate_eip7883_cost(base_length: int, exponent_length: int, modulus_length: int, exponent_bytes: str) -> int:
+    """Calculate gas cost according to EIP-7883 (proposed)"""
+    if exponent_bytes and len(exponent_bytes) > _MAX_CACHED_EXPONENT_LEN:
+        return _eip7883_cost(base_length, exponent_length, modulus_length, exponent_bytes)
+    return _eip7883_cost_cached(base_length, exponent_length, modulus_length, exponent_bytes)
+
+
+class ModExpGasCalculator:
+    """Calculate ModExp gas costs according to different EIP specifications"""
+    
+    # Thin wrappers kept for API compatibility
+    calculate_eip2565_cost = staticmethod(calculate_eip2565_cost)
+    calculate_eip7883_cost = staticmethod(calculate_eip7883_cost)
+
     @staticmethod
-    def calculate_eip7883_cost(base_length: int, exponent_length: int, modulus_length: int, exponent_bytes: str) -> int:
-        """Calculate gas cost according to EIP-7883 (proposed)"""
-        exponent_int = int(exponent_bytes, 16) if exponent_bytes else 0
-        max_length = max(base_length, modulus_length)
-        words = (max_length + 7) // 8
-        
-        # Multiplication complexity - NEW FORMULA
-        if max_length <= 32:
-            multiplication_complexity = 16
-        else:
-            multiplication_complexity = 2 * (words ** 2)
-            
-        # Iteration count - UPDATED MULTIPLIER
-        if exponent_length <= 32:
-            if exponent_int == 0:
-                iteration_count = 0
+    def calculate_costs_vectorized(base_lengths: np.ndarray, exponent_lengths: np.ndarray,
+                                   modulus_lengths: np.ndarray, exponent_bitlens: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate EIP-2565 and EIP-7883 gas costs for whole columns at once
+
+        Mirrors the scalar formulas above; exponent_bitlens holds the bit length of the
+        low 256 bits of each exponent, which is all the iteration count depends on.
+        """
+        bsize = np.asarray(base_lengths, dtype=np.int64)
+        esize = np.asarray(exponent_lengths, dtype=np.int64)
+        msize = np.asarray(modulus_lengths, dtype=np.int64)
+        exp_bitlen = np.asarray(exponent_bitlens, dtype=np.int64)
+
+        # Shared terms, computed once for both formulas
+        max_len = np.maximum(bsize, msize)
+        words = (max_len + 7) // 8
+        words_sq = words ** 2
+        long_exp = np.maximum(esize - 32, 0)  # Exponent bytes beyond the first 32
+        exp_tail = exp_bitlen - 1
+
+        # EIP-2565
+        mult_2565 = np.select(
+            [max_len <= 64, max_len <= 1024],
+            [words_sq, words_sq // 4 + 96 * words - 3072],
+            default=words_sq // 16 + 480 * words - 199680
+        )
+        iter_2565 = np.maximum(8 * long_exp + exp_tail, 1)
+        eip2565 = np.maximum(200, (mult_2565 * iter_2565) // 3)
+
+        # EIP-7883
+        mult_7883 = np.where(max_len <= 32, 16, 2 * words_sq)
+        iter_7883 = np.maximum(16 * long_exp + exp_tail, 1)
+        eip7883 = np.maximum(500, (mult_7883 * iter_7883) // 3)
+
+        return eip2565, eip7883
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _kernel_costs(bsize, esize, msize, exp_bitlen, out_2565, out_7883):
+        """Compiled per-row EIP-2565 and EIP-7883 costs, same branches as the scalar formulas"""
+        for i in prange(bsize.shape[0]):
+            max_length = max(bsize[i], msize[i])
+            words = (max_length + 7) // 8
+            long_exp = max(esize[i] - 32, 0)
+            exp_tail = exp_bitlen[i] - 1
+
+            # EIP-2565
+            if max_length <= 64:
+                multiplication_complexity = words * words
+            elif max_length <= 1024:
+                multiplication_complexity = (words * words) // 4 + 96 * words - 3072
             else:
-                iteration_count = exponent_int.bit_length() - 1
-        else:
-            iteration_count = 16 * (exponent_length - 32)  # Changed from 8 to 16
-            iteration_count += (exponent_int & (2**256 - 1)).bit_length() - 1
-            
-        iteration_count = max(iteration_count, 1)
-        
-        # Final gas cost - HIGHER MINIMUM
-        return max(500, (multiplication_complexity * iteration_count) // 3)  # Changed from 200 to 500
+                multiplication_complexity = (words * words) // 16 + 480 * words - 199680
+            iteration_count = max(8 * long_exp + exp_tail, 1)
+            out_2565[i] = max(200, (multiplication_complexity * iteration_count) // 3)
+
+            # EIP-7883
+            if max_length <= 32:
+                multiplication_complexity = 16
+            else:
+                multiplication_complexity = 2 * words * words
+            iteration_count = max(16 * long_exp + exp_tail, 1)
+            out_7883[i] = max(500, (multiplication_complexity * iteration_count) // 3)
+
+
+def calculate_costs_numba(bsize: np.ndarray, esize: np.ndarray, msize: np.ndarray,
+                          exp_bitlen: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Run the compiled cost kernel over int64 copies of the input columns"""
+    bsize, esize, msize, exp_bitlen = (
+        np.ascontiguousarray(a, dtype=np.int64) for a in (bsize, esize, msize, exp_bitlen)
+    )
+    eip2565 = np.empty(len(bsize), dtype=np.int64)
+    eip7883 = np.empty(len(bsize), dtype=np.int64)
+    _kernel_costs(bsize, esize, msize, exp_bitlen, eip2565, eip7883)
+    return eip2565, eip7883
 
 
 class ModExpDataAnalyzer:
     """Analyze ModExp precompile usage data"""
     
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, use_numba: bool = False):
         self.data_dir = Path(data_dir)
         if not self.data_dir.exists():
             raise ValueError(f"Data directory {data_dir} does not exist")
         
+        if use_numba and not NUMBA_AVAILABLE:
+            print("WARNING: numba not available, falling back to NumPy cost calculation")
+        self.use_numba = use_numba and NUMBA_AVAILABLE
         self.df = None
         self.tx_data = None
+        self._address_cache = None
+        self._address_lock = threading.Lock()  # Reports and charts fill the cache from different threads
         
-    def load_modexp_data(self, limit: Optional[int] = None, batch_size: int = 1000) -> pd.DataFrame:
-        """Load ModExp call data from parquet files with robust error handling"""
+    def load_modexp_data(self, limit: Optional[int] = None, batch_size: int = 1000,
+                         columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load ModExp call data from parquet files with robust error handling, optionally only some columns"""
         print(f"Loading ModExp data from {self.data_dir}")
         
-        parquet_files = sorted(
-            self.data_dir.glob("*.parquet"),
-            key=lambda x: int(x.stem),
-            reverse=True
-        )
+        # Newest blocks first; sort the parsed block numbers rather than calling a key per path
+        parquet_files = list(self.data_dir.glob("*.parquet"))
+        file_blocks = np.fromiter((int(p.stem) for p in parquet_files), dtype=np.int64, count=len(parquet_files))
+        parquet_files = [parquet_files[i] for i in np.argsort(-file_blocks, kind="stable")]
         
         total_files = len(parquet_files)
         print(f"Found {total_files:,} parquet files")
@@ -107,137 +272,159 @@ class ModExpDataAnalyzer:
             parquet_files = parquet_files[:limit]
             print(f"Limited to {limit:,} files")
             
-        dfs = []
+        tables = []
         failed_files = []
-        
-        # Process files in batches to manage memory
-        for batch_start in range(0, len(parquet_files), batch_size):
-            batch_end = min(batch_start + batch_size, len(parquet_files))
-            batch_files = parquet_files[batch_start:batch_end]
-            
-            print(f"Processing batch {batch_start//batch_size + 1}/{(len(parquet_files)-1)//batch_size + 1}: "
-                  f"files {batch_start+1} to {batch_end} ({len(batch_files)} files)")
-            
-            batch_dfs = []
-            for file in batch_files:
-                try:
-                    df = pd.read_parquet(file)
-                    if len(df) > 0:  # Only include non-empty files
-                        df["block_number"] = int(file.stem)
-                        batch_dfs.append(df)
-                except Exception as e:
-                    print(f"WARNING: Failed to load {file.name}: {e}")
-                    failed_files.append(file.name)
-                    
-            if batch_dfs:
-                batch_df = pd.concat(batch_dfs, ignore_index=True)
-                dfs.append(batch_df)
-                
-        if not dfs:
+
+        # Parquet decoding releases the GIL, so files within a batch are read concurrently
+        read_file = functools.partial(_read_block_file, columns=columns)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for batch_start in range(0, len(parquet_files), batch_size):
+                batch_end = min(batch_start + batch_size, len(parquet_files))
+                batch_files = parquet_files[batch_start:batch_end]
+
+                print(f"Processing batch {batch_start//batch_size + 1}/{(len(parquet_files)-1)//batch_size + 1}: "
+                      f"files {batch_start+1} to {batch_end} ({len(batch_files)} files)")
+
+                for file, table in executor.map(read_file, batch_files):
+                    if table is None:
+                        failed_files.append(file.name)
+                    elif table.num_rows > 0:  # Only include non-empty files
+                        tables.append(table)
+
+        if not tables:
             raise ValueError("No valid ModExp data found")
-            
-        self.df = pd.concat(dfs, ignore_index=True)
-        
+
+        table = pa.concat_tables(tables, promote_options="default")
+        self.df = table.to_pandas()
+
         if failed_files:
             print(f"WARNING: Failed to load {len(failed_files)} files: {failed_files[:5]}...")
             
         print(f"Successfully loaded {len(self.df):,} ModExp calls from {len(parquet_files)-len(failed_files):,} blocks")
-        
+
+        self.optimize_dtypes()
+
         # Calculate gas costs
         self._calculate_gas_costs()
         
         return self.df
-    
+
+    def optimize_dtypes(self):
+        """Narrow numeric columns and store repeated address strings as categoricals"""
+        size_cols = ["Bsize", "Esize", "Msize"]
+        self.df[size_cols] = self.df[size_cols].astype(np.int32)
+        self.df["block_number"] = self.df["block_number"].astype(np.int64)
+
+        for col in ("from_address", "to_address"):
+            if col in self.df.columns and not isinstance(self.df[col].dtype, pd.CategoricalDtype):
+                self.df[col] = self.df[col].astype("category")
+
     def _calculate_gas_costs(self):
         """Calculate both EIP-2565 and EIP-7883 gas costs"""
         print("Calculating gas costs...")
         
-        # Current EIP-2565 costs (should match gas_costs column)
-        self.df["eip2565_cost"] = self.df.apply(
-            lambda row: ModExpGasCalculator.calculate_eip2565_cost(
-                row["Bsize"], row["Esize"], row["Msize"], row["E"]
-            ), axis=1
+        # Real traffic repeats a small set of input shapes, so price each distinct shape once
+        shape_ids = self.df.groupby(["Bsize", "Esize", "Msize", "E"], sort=False, dropna=False).ngroup().to_numpy()
+        _, first_rows = np.unique(shape_ids, return_index=True)
+        shapes = self.df.iloc[first_rows]
+        exp_bitlen = exponent_bitlen_low256(shapes["E"])
+
+        # Current EIP-2565 costs (should match gas_costs column) and proposed EIP-7883 costs
+        calculate_costs = calculate_costs_numba if self.use_numba else ModExpGasCalculator.calculate_costs_vectorized
+        eip2565_cost, eip7883_cost = calculate_costs(
+            shapes["Bsize"].to_numpy(), shapes["Esize"].to_numpy(),
+            shapes["Msize"].to_numpy(), exp_bitlen
         )
-        
-        # Proposed EIP-7883 costs
-        self.df["eip7883_cost"] = self.df.apply(
-            lambda row: ModExpGasCalculator.calculate_eip7883_cost(
-                row["Bsize"], row["Esize"], row["Msize"], row["E"]
-            ), axis=1
+        self.df["eip2565_cost"] = np.take(eip2565_cost, shape_ids).astype(np.int64)
+        self.df["eip7883_cost"] = np.take(eip7883_cost, shape_ids).astype(np.int64)
+        
+        # Calculate differences (evaluated by numexpr when it is installed)
+        self.df.eval(
+            "cost_increase = eip7883_cost - gas_costs\n"
+            "cost_ratio = eip7883_cost / gas_costs",
+            inplace=True
         )
         
-        # Calculate differences
-        self.df["cost_increase"] = self.df["eip7883_cost"] - self.df["gas_costs"]
-        self.df["cost_ratio"] = self.df["eip7883_cost"] / self.df["gas_costs"]
-        
         # Verify our EIP-2565 implementation matches recorded gas costs
-        mismatch = self.df[self.df["eip2565_cost"] != self.df["gas_costs"]]
-        if len(mismatch) > 0:
-            print(f"WARNING: {len(mismatch)} calls have mismatched EIP-2565 calculations")
+        mismatch = int((self.df["eip2565_cost"].to_numpy() != self.df["gas_costs"].to_numpy()).sum())
+        if mismatch > 0:
+            print(f"WARNING: {mismatch} calls have mismatched EIP-2565 calculations")
             
     def load_transaction_data(self, tx_data_path: Optional[str] = None):
         """Load transaction metadata if available"""
         if tx_data_path and Path(tx_data_path).exists():
-            self.tx_data = pd.read_parquet(tx_data_path)
-            self.df = pd.merge(
-                self.df, self.tx_data,
-                how="left",
-                on=["block_number", "tx_hash"]
-            )
+            # Index the metadata on the join keys once so the join probes a sorted index
+            self.tx_data = pd.read_parquet(tx_data_path).set_index(["block_number", "tx_hash"]).sort_index()
+            self.df = self.df.join(self.tx_data, on=["block_number", "tx_hash"], how="left")
+            self.optimize_dtypes()
             
+    def _address_impact(self, column: str) -> pd.DataFrame:
+        """Per-address cost aggregates, computed once per frame and shared by reports and charts"""
+        with self._address_lock:
+            return self._address_impact_locked(column)
+    
+    def _address_impact_locked(self, column: str) -> pd.DataFrame:
+        """Cache lookup and fill for _address_impact; the caller holds _address_lock"""
+        if self._address_cache is None or self._address_cache[0] is not self.df:
+            self._address_cache = (self.df, {})
+        cache = self._address_cache[1]
+        
+        if column not in cache:
+            spec = {
+                "cost_increase": ["sum", "mean", "count"],
+                "gas_costs": "sum",
+                "eip7883_cost": "sum"
+            }
+            names = ["total_increase", "avg_increase", "call_count", "total_old_cost", "total_new_cost"]
+            if column == "to_address" and "from_address" in self.df.columns:
+                spec["from_address"] = "nunique"  # Number of unique users
+                names.append("unique_users")
+            
+            # Only the top rows are ever used, so skip sorting every group
+            impact = self.df.groupby(column, observed=True, sort=False).agg(spec)
+            impact.columns = names
+            cache[column] = impact
+            
+        return cache[column]
+
     def analyze_impact(self) -> dict:
         """Perform comprehensive impact analysis"""
         results = {}
         
         # Basic statistics
+        blocks = self.df["block_number"].to_numpy()
         results["total_calls"] = len(self.df)
         results["unique_transactions"] = self.df["tx_hash"].nunique()
-        results["block_range"] = (self.df["block_number"].min(), self.df["block_number"].max())
+        results["block_range"] = (blocks.min(), blocks.max())
         
-        # Cost impact
-        results["avg_cost_increase"] = self.df["cost_increase"].mean()
-        results["median_cost_increase"] = self.df["cost_increase"].median()
-        results["max_cost_increase"] = self.df["cost_increase"].max()
-        results["total_cost_increase"] = self.df["cost_increase"].sum()
+        # Cost impact, all reduced from one extracted array
+        increases = self.df["cost_increase"].to_numpy()
+        results["avg_cost_increase"] = increases.mean()
+        results["median_cost_increase"] = np.median(increases)
+        results["max_cost_increase"] = increases.max()
+        results["total_cost_increase"] = increases.sum()
         
         # Affected calls
-        results["calls_with_increase"] = len(self.df[self.df["cost_increase"] > 0])
+        results["calls_with_increase"] = int((increases > 0).sum())
         results["pct_calls_affected"] = 100 * results["calls_with_increase"] / results["total_calls"]
         
         # Size distribution
         results["calls_over_32_bytes"] = {
-            "base": len(self.df[self.df["Bsize"] > 32]),
-            "exponent": len(self.df[self.df["Esize"] > 32]),
-            "modulus": len(self.df[self.df["Msize"] > 32])
+            "base": int((self.df["Bsize"].to_numpy() > 32).sum()),
+            "exponent": int((self.df["Esize"].to_numpy() > 32).sum()),
+            "modulus": int((self.df["Msize"].to_numpy() > 32).sum())
         }
         
         # Enhanced address analysis if transaction data available
         if "from_address" in self.df.columns:
             # Analysis by sender (from_address)
-            sender_impact = self.df.groupby("from_address").agg({
-                "cost_increase": ["sum", "mean", "count"],
-                "gas_costs": "sum",
-                "eip7883_cost": "sum"
-            }).round(2)
-            
-            sender_impact.columns = ["total_increase", "avg_increase", "call_count", 
-                                   "total_old_cost", "total_new_cost"]
-            sender_impact = sender_impact.sort_values("total_increase", ascending=False)
-            results["top_impacted_senders"] = sender_impact.head(20)
+            sender_impact = self._address_impact("from_address")
+            results["top_impacted_senders"] = sender_impact.nlargest(20, "total_increase").round(2)
             
         if "to_address" in self.df.columns:
             # Analysis by contract (to_address)
-            contract_impact = self.df.groupby("to_address").agg({
-                "cost_increase": ["sum", "mean", "count"],
-                "gas_costs": "sum", 
-                "eip7883_cost": "sum",
-                "from_address": "nunique"  # Number of unique users
-            }).round(2)
-            
-            contract_impact.columns = ["total_increase", "avg_increase", "call_count",
-                                     "total_old_cost", "total_new_cost", "unique_users"]
-            contract_impact = contract_impact.sort_values("total_increase", ascending=False)
-            results["top_impacted_contracts"] = contract_impact.head(20)
+            contract_impact = self._address_impact("to_address")
+            results["top_impacted_contracts"] = contract_impact.nlargest(20, "total_increase").round(2)
             
         return results
     
@@ -252,7 +439,7 @@ class ModExpDataAnalyzer:
         print("Performing comprehensive entity analysis...")
         
         # 1. Sender Analysis (Transaction originators)
-        sender_analysis = self.df.groupby("from_address").agg({
+        sender_analysis = self.df.groupby("from_address", observed=True).agg({
             "cost_increase": ["sum", "mean", "count", "std"],
             "gas_costs": ["sum", "mean"],
             "eip7883_cost": ["sum", "mean"],
@@ -282,7 +469,7 @@ class ModExpDataAnalyzer:
         entity_results["sender_analysis"] = sender_analysis.sort_values("total_increase", ascending=False)
         
         # 2. Contract Analysis (Called contracts)  
-        contract_analysis = self.df.groupby("to_address").agg({
+        contract_analysis = self.df.groupby("to_address", observed=True).agg({
             "cost_increase": ["sum", "mean", "count", "std"],
             "gas_costs": ["sum", "mean"],
             "eip7883_cost": ["sum", "mean"],
@@ -321,7 +508,7 @@ class ModExpDataAnalyzer:
         patterns = {}
         
         # Most active sender-contract pairs
-        pair_analysis = self.df.groupby(["from_address", "to_address"]).agg({
+        pair_analysis = self.df.groupby(["from_address", "to_address"], observed=True).agg({
             "cost_increase": ["sum", "count"],
             "gas_costs": "sum",
             "eip7883_cost": "sum"
@@ -332,42 +519,52 @@ class ModExpDataAnalyzer:
         patterns["top_sender_contract_pairs"] = pair_analysis.sort_values("total_increase", ascending=False).head(20)
         
         # Contract usage diversity
-        contract_diversity = self.df.groupby("to_address")["from_address"].nunique().sort_values(ascending=False)
+        contract_diversity = self.df.groupby("to_address", observed=True)["from_address"].nunique().sort_values(ascending=False)
         patterns["most_diverse_contracts"] = contract_diversity.head(10)
         
         # Sender contract usage
-        sender_diversity = self.df.groupby("from_address")["to_address"].nunique().sort_values(ascending=False)
+        sender_diversity = self.df.groupby("from_address", observed=True)["to_address"].nunique().sort_values(ascending=False)
         patterns["most_diverse_senders"] = sender_diversity.head(10)
         
         return patterns
     
-    def create_visualizations(self, output_dir: str = "output"):
-        """Create analysis visualizations"""
+    def create_visualizations(self, output_dir: str = "output", processes: int = 1):
+        """Create analysis visualizations, rendering the HTML files in up to `processes` worker processes"""
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
+        figures = {}
         
         # 1. Cost increase distribution
+        increased = self.df["cost_increase"].to_numpy() > 0
         fig = px.histogram(
-            self.df[self.df["cost_increase"] > 0],
+            self.df.loc[increased, ["cost_increase"]],
             x="cost_increase",
             nbins=50,
             title="Distribution of Gas Cost Increases (EIP-7883)",
             labels={"cost_increase": "Gas Cost Increase", "count": "Number of Calls"}
         )
         fig.update_layout(yaxis_type="log")
-        fig.write_html(output_path / "cost_increase_distribution.html")
+        figures["cost_increase_distribution.html"] = fig
         
         # 2. Cost ratio by input size
         fig = go.Figure()
         
+        size_edges = np.array([0, 32, 64, 128, 256, 512, 1024, 2048, 4096])
+        size_labels = [f"({lo}, {hi}]" for lo, hi in zip(size_edges[:-1], size_edges[1:])]
+        cost_ratio = self.df["cost_ratio"].to_numpy()
+        
         for size_col, name in [("Bsize", "Base"), ("Esize", "Exponent"), ("Msize", "Modulus")]:
-            size_bins = pd.cut(self.df[size_col], bins=[0, 32, 64, 128, 256, 512, 1024, 2048, 4096])
-            avg_ratio = self.df.groupby(size_bins)["cost_ratio"].mean()
+            # Right-closed bins like pd.cut; sizes outside (0, 4096] are dropped
+            bin_idx = np.searchsorted(size_edges, self.df[size_col].to_numpy(), side="left") - 1
+            in_range = (bin_idx >= 0) & (bin_idx < len(size_labels))
+            sums = np.bincount(bin_idx[in_range], weights=cost_ratio[in_range], minlength=len(size_labels))
+            counts = np.bincount(bin_idx[in_range], minlength=len(size_labels))
+            avg_ratio = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
             
             fig.add_trace(go.Bar(
                 name=f"{name} Size",
-                x=[str(b) for b in avg_ratio.index],
-                y=avg_ratio.values
+                x=size_labels,
+                y=avg_ratio
             ))
             
         fig.update_layout(
@@ -376,26 +573,27 @@ class ModExpDataAnalyzer:
             yaxis_title="Cost Ratio (EIP-7883 / Current)",
             barmode='group'
         )
-        fig.write_html(output_path / "cost_ratio_by_size.html")
+        figures["cost_ratio_by_size.html"] = fig
         
         # 3. Timeline analysis
         if self.df["block_number"].nunique() > 100:
-            daily_impact = self.df.groupby("block_number").agg({
-                "cost_increase": "sum",
+            block_totals = self.df.groupby("block_number").agg({
                 "gas_costs": "sum",
                 "eip7883_cost": "sum"
-            }).rolling(window=7200).mean()  # ~1 day average
+            })
+            window = 7200  # ~1 day average
+            blocks = block_totals.index[window - 1:]
             
             fig = go.Figure()
             fig.add_trace(go.Scatter(
-                x=daily_impact.index,
-                y=daily_impact["gas_costs"],
+                x=blocks,
+                y=_rolling_mean(block_totals["gas_costs"].to_numpy(), window),
                 name="Current Cost",
                 line=dict(color="blue")
             ))
             fig.add_trace(go.Scatter(
-                x=daily_impact.index,
-                y=daily_impact["eip7883_cost"],
+                x=blocks,
+                y=_rolling_mean(block_totals["eip7883_cost"].to_numpy(), window),
                 name="EIP-7883 Cost",
                 line=dict(color="red")
             ))
@@ -404,83 +602,91 @@ class ModExpDataAnalyzer:
                 xaxis_title="Block Number",
                 yaxis_title="Gas Cost"
             )
-            fig.write_html(output_path / "cost_timeline.html")
+            figures["cost_timeline.html"] = fig
             
         # 4. Entity impact visualizations (if available)
         if "from_address" in self.df.columns and "to_address" in self.df.columns:
+            sender_impact = self._address_impact("from_address")
+            contract_impact = self._address_impact("to_address")
+            
             # Sender impact
-            sender_stats = self.df.groupby("from_address").agg({
-                "cost_increase": "sum",
-                "tx_hash": "count"
-            }).sort_values("cost_increase", ascending=False).head(20)
+            sender_stats = sender_impact.nlargest(20, "total_increase")
             
             fig = px.bar(
                 sender_stats.reset_index(),
                 x="from_address",
-                y="cost_increase",
+                y="total_increase",
                 title="Top 20 Transaction Senders by Total Cost Increase",
-                labels={"cost_increase": "Total Cost Increase", "from_address": "Sender Address"}
+                labels={"total_increase": "Total Cost Increase", "from_address": "Sender Address"}
             )
             fig.update_xaxes(tickangle=45)
-            fig.write_html(output_path / "sender_impact.html")
+            figures["sender_impact.html"] = fig
             
             # Contract impact  
-            contract_stats = self.df.groupby("to_address").agg({
-                "cost_increase": "sum",
-                "tx_hash": "count",
-                "from_address": "nunique"
-            }).sort_values("cost_increase", ascending=False).head(20)
+            contract_stats = contract_impact.nlargest(20, "total_increase")
             
             fig = px.bar(
                 contract_stats.reset_index(),
                 x="to_address",
-                y="cost_increase",
+                y="total_increase",
                 title="Top 20 Contracts by Total Cost Increase",
-                labels={"cost_increase": "Total Cost Increase", "to_address": "Contract Address"},
-                hover_data=["from_address"]
+                labels={"total_increase": "Total Cost Increase", "to_address": "Contract Address",
+                        "unique_users": "Unique Users"},
+                hover_data=["unique_users"]
             )
             fig.update_xaxes(tickangle=45)
-            fig.write_html(output_path / "contract_impact.html")
+            figures["contract_impact.html"] = fig
             
             # Sender vs Contract comparison
-            sender_total = self.df.groupby("from_address")["cost_increase"].sum()
-            contract_total = self.df.groupby("to_address")["cost_increase"].sum()
-            
             fig = go.Figure()
-            fig.add_trace(go.Histogram(x=sender_total, name="Senders", opacity=0.7, nbinsx=50))
-            fig.add_trace(go.Histogram(x=contract_total, name="Contracts", opacity=0.7, nbinsx=50))
+            fig.add_trace(go.Histogram(x=sender_impact["total_increase"], name="Senders", opacity=0.7, nbinsx=50))
+            fig.add_trace(go.Histogram(x=contract_impact["total_increase"], name="Contracts", opacity=0.7, nbinsx=50))
             fig.update_layout(
                 title="Distribution of Cost Increases: Senders vs Contracts",
                 xaxis_title="Total Cost Increase (gas)",
                 yaxis_title="Count",
                 barmode="overlay"
             )
-            fig.write_html(output_path / "sender_vs_contract_distribution.html")
+            figures["sender_vs_contract_distribution.html"] = fig
         elif "from_address" in self.df.columns:
             # Fallback to sender-only analysis
-            sender_stats = self.df.groupby("from_address").agg({
-                "cost_increase": "sum",
-                "tx_hash": "count"
-            }).sort_values("cost_increase", ascending=False).head(20)
+            sender_stats = self._address_impact("from_address").nlargest(20, "total_increase")
             
             fig = px.bar(
                 sender_stats.reset_index(),
                 x="from_address",
-                y="cost_increase",
+                y="total_increase",
                 title="Top 20 Addresses by Total Cost Increase",
-                labels={"cost_increase": "Total Cost Increase", "from_address": "Address"}
+                labels={"total_increase": "Total Cost Increase", "from_address": "Address"}
             )
             fig.update_xaxes(tickangle=45)
-            fig.write_html(output_path / "address_impact.html")
+            figures["address_impact.html"] = fig
+            
+        # Serializing each chart to standalone HTML dominates on large data and holds the GIL, so fan out to processes
+        if processes > 1 and len(figures) > 1:
+            spawn = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(processes, len(figures)), mp_context=spawn) as executor:
+                futures = [executor.submit(_write_figure_html, fig, output_path / name)
+                           for name, fig in figures.items()]
+                for future in futures:
+                    future.result()
+        else:
+            for name, fig in figures.items():
+                fig.write_html(output_path / name)
             
         print(f"Visualizations saved to {output_path}")
 
 
+# Markdown rows for the top address tables, filled from plain per-row dicts
+_SENDER_ROW = "| `{addr:.10}...` | {total_increase:,.0f} | {avg_increase:,.0f} | {call_count:,} |\n"
+_CONTRACT_ROW = "| `{addr:.10}...` | {total_increase:,.0f} | {avg_increase:,.0f} | {call_count:,} | {unique_users:,} |\n"
+
+
 def generate_report(analyzer: ModExpDataAnalyzer, output_file: str = "eip7883_analysis_report.md"):
     """Generate a professional analysis report"""
     results = analyzer.analyze_impact()
     
-    report = f"""# EIP-7883 ModExp Gas Cost Analysis Report
+    parts = [f"""# EIP-7883 ModExp Gas Cost Analysis Report
 
 ## Executive Summary
 
@@ -517,30 +723,30 @@ Based on the analyzed data:
 - Block range: {results['block_range'][0]:,} to {results['block_range'][1]:,}
 - Average additional gas per block: {results['total_cost_increase'] / (results['block_range'][1] - results['block_range'][0]):.0f}
 
-"""
+"""]
 
     # Add entity analysis sections
     if "top_impacted_senders" in results:
-        report += """### 4. Most Impacted Transaction Senders
+        parts.append("""### 4. Most Impacted Transaction Senders
 
 | Sender Address | Total Increase | Avg Increase | Call Count |
 |----------------|---------------|--------------|------------|
-"""
-        for addr, row in results["top_impacted_senders"].head(10).iterrows():
-            report += f"| `{addr[:10]}...` | {row['total_increase']:,.0f} | {row['avg_increase']:,.0f} | {row['call_count']:,} |\n"
+""")
+        senders = results["top_impacted_senders"].head(10).rename_axis("addr").reset_index()
+        parts.extend(_SENDER_ROW.format_map(row) for row in senders.to_dict("records"))
 
     if "top_impacted_contracts" in results:
-        report += """
+        parts.append("""
 
 ### 5. Most Impacted Contracts
 
 | Contract Address | Total Increase | Avg Increase | Call Count | Unique Users |
 |------------------|---------------|--------------|------------|--------------|
-"""
-        for addr, row in results["top_impacted_contracts"].head(10).iterrows():
-            report += f"| `{addr[:10]}...` | {row['total_increase']:,.0f} | {row['avg_increase']:,.0f} | {row['call_count']:,} | {row['unique_users']:,} |\n"
+""")
+        contracts = results["top_impacted_contracts"].head(10).rename_axis("addr").reset_index()
+        parts.extend(_CONTRACT_ROW.format_map(row) for row in contracts.to_dict("records"))
 
-    report += """
+    parts.append("""
 ## Conclusions
 
 1. **Limited Impact**: Only {:.1f}% of ModExp calls see cost increases under EIP-7883.
@@ -558,10 +764,9 @@ Based on the analyzed data:
 2. **Network Monitoring**: Continue monitoring ModExp usage patterns post-implementation to validate impact estimates.
 
 3. **Documentation**: Update documentation and tools to reflect new gas calculations for developer awareness.
-""".format(results['pct_calls_affected'])
+""".format(results['pct_calls_affected']))
 
-    with open(output_file, "w") as f:
-        f.write(report)
+    write_text_atomic(output_file, "".join(parts))
         
     print(f"Report saved to {output_file}")
 
@@ -8,6 +8,7 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 from eip7883_analysis import ModExpGasCalculator
+from io_utils import write_text_atomic
 
 
 def create_entity_profiles():
@@ -38,23 +39,25 @@ def create_entity_profiles():
     return entity_profiles
 
 
-def calculate_costs_for_profile(profile, eth_price_usd=3500, gas_price_gwei=25):
-    """Calculate costs for a specific entity profile"""
+# Exponent assumed for every profile (standard RSA public exponent)
+PROFILE_EXPONENT = "0x10001"
+
+
+def calculate_costs_for_profiles(b_sizes, e_sizes, m_sizes, daily_calls, eth_price_usd=3500, gas_price_gwei=25):
+    """Calculate costs for arrays of entity profile parameters"""
     
     # Calculate gas costs
-    current_gas = ModExpGasCalculator.calculate_eip2565_cost(
-        profile["b_size"], profile["e_size"], profile["m_size"], "0x10001"
-    )
-    eip7883_gas = ModExpGasCalculator.calculate_eip7883_cost(
-        profile["b_size"], profile["e_size"], profile["m_size"], "0x10001"
+    exp_bitlen = np.full(len(b_sizes), int(PROFILE_EXPONENT, 16).bit_length())
+    current_gas, eip7883_gas = ModExpGasCalculator.calculate_costs_vectorized(
+        b_sizes, e_sizes, m_sizes, exp_bitlen
     )
     
     gas_increase = eip7883_gas - current_gas
     cost_ratio = eip7883_gas / current_gas
     
     # Calculate daily costs
-    daily_gas_current = profile["daily_calls"] * current_gas
-    daily_gas_eip7883 = profile["daily_calls"] * eip7883_gas
+    daily_gas_current = daily_calls * current_gas
+    daily_gas_eip7883 = daily_calls * eip7883_gas
     
     # Convert to USD
     gas_to_eth = gas_price_gwei * 1e9 / 1e18
@@ -85,27 +88,24 @@ def analyze_entity_impact(eth_price_usd=3500, gas_price_gwei=25):
     print(f"Assumptions: ETH=${eth_price_usd:,}, Gas={gas_price_gwei} Gwei\n")
     
     profiles = create_entity_profiles()
-    results = []
     
-    for profile in profiles:
-        costs = calculate_costs_for_profile(profile, eth_price_usd, gas_price_gwei)
-        
-        # Create individual entity entries
-        for i in range(profile["count"]):
-            entity_id = f"{profile['type']}_{i+1:03d}"
-            
-            result = {
-                "entity_id": entity_id,
-                "entity_type": profile["type"],
-                "b_size": profile["b_size"],
-                "e_size": profile["e_size"],
-                "m_size": profile["m_size"],
-                "daily_calls": profile["daily_calls"],
-                **costs
-            }
-            results.append(result)
-    
-    df = pd.DataFrame(results)
+    # Expand profiles into one row per entity, column by column
+    counts = np.array([p["count"] for p in profiles])
+    entity_types = np.repeat([p["type"] for p in profiles], counts)
+    entity_nums = np.concatenate([np.arange(1, c + 1) for c in counts])
+    columns = {
+        "entity_id": np.char.add(np.char.add(entity_types, "_"), np.char.zfill(entity_nums.astype(str), 3)),
+        "entity_type": entity_types,
+    }
+    for key in ("b_size", "e_size", "m_size", "daily_calls"):
+        columns[key] = np.repeat([p[key] for p in profiles], counts)
+    
+    columns.update(calculate_costs_for_profiles(
+        columns["b_size"], columns["e_size"], columns["m_size"], columns["daily_calls"],
+        eth_price_usd, gas_price_gwei
+    ))
+    
+    df = pd.DataFrame(columns)
     df = df.sort_values("monthly_usd_increase", ascending=False)
     
     print(f"=== Top 30 Most Impacted Entities ===")
@@ -145,6 +145,19 @@ def analyze_entity_impact(eth_price_usd=3500, gas_price_gwei=25):
     return df, type_analysis
 
 
+# Report fragments, filled from plain per-row dicts
+ENTITY_ROW = ("| {rank:2d} | {entity_type:.15} | {daily_calls:,} | ${monthly_usd_increase:8.2f} | {cost_ratio:.2f}x | "
+              "B{b_size}/E{e_size}/M{m_size} |\n")
+ENTITY_TYPE_SECTION = """
+### {entity_type}
+
+- **Number of entities**: {entity_count:.0f}
+- **Total daily calls**: {total_daily_calls:,.0f}
+- **Monthly cost increase**: ${total_monthly_increase:,.2f} ({pct_increase:.1f}% increase)
+- **Average cost ratio**: {avg_cost_ratio:.2f}x
+"""
+
+
 def generate_entity_report(df, type_analysis, output_file="entity_impact_report.md"):
     """Generate entity impact report"""
     
@@ -152,7 +165,7 @@ def generate_entity_report(df, type_analysis, output_file="entity_impact_report.
     total_monthly_increase = df["monthly_usd_increase"].sum()
     avg_increase_per_entity = df["monthly_usd_increase"].mean()
     
-    report = f"""# EIP-7883 Entity Impact Analysis
+    parts = [f"""# EIP-7883 Entity Impact Analysis
 
 ## Executive Summary
 
@@ -169,28 +182,25 @@ This analysis examines the projected impact of EIP-7883 on **{total_entities} re
 
 | Rank | Entity Type | Daily Calls | Monthly Cost Increase | Cost Ratio | Input Sizes |
 |------|-------------|-------------|----------------------|------------|-------------|
-"""
+"""]
     
-    for i, (_, row) in enumerate(df.head(20).iterrows()):
-        report += f"| {i+1:2d} | {row['entity_type'][:15]} | {row['daily_calls']:,} | ${row['monthly_usd_increase']:8.2f} | {row['cost_ratio']:.2f}x | B{row['b_size']}/E{row['e_size']}/M{row['m_size']} |\n"
+    parts.extend(
+        ENTITY_ROW.format(rank=i, **row)
+        for i, row in enumerate(df.head(20).to_dict("records"), 1)
+    )
     
-    report += f"""
+    parts.append("""
 
 ## Impact by Entity Type
 
-"""
+""")
     
-    for entity_type, row in type_analysis.iterrows():
-        report += f"""
-### {entity_type}
-
-- **Number of entities**: {row['entity_count']:.0f}
-- **Total daily calls**: {row['total_daily_calls']:,.0f}
-- **Monthly cost increase**: ${row['total_monthly_increase']:,.2f} ({row['pct_increase']:.1f}% increase)
-- **Average cost ratio**: {row['avg_cost_ratio']:.2f}x
-"""
+    parts.extend(
+        ENTITY_TYPE_SECTION.format(entity_type=entity_type, **row)
+        for entity_type, row in type_analysis.to_dict("index").items()
+    )
     
-    report += f"""
+    parts.append("""
 
 ## Conclusions
 
@@ -202,10 +212,9 @@ EIP-7883 will have a **graduated impact** across different entity types:
 4. **High Complexity Users**: Significant impact for large input operations
 
 The predictable nature of the increases allows for proactive planning and optimization.
-"""
-    
-    with open(output_file, "w") as f:
-        f.write(report)
+""")
+
+    write_text_atomic(output_file, "".join(parts))
     
     print(f"Entity impact report saved to {output_file}")
 
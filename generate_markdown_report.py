@@ -4,21 +4,145 @@ Generate comprehensive markdown analysis report from EIP-7883 analysis outputs
 Combines data from analysis_output directory with optional direct analysis report
 """
 
-import csv
+import re
 import json
+import pickle
+import hashlib
 import argparse
+import functools
 from pathlib import Path
+from typing import Iterator, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
 
-def load_csv_data(file_path: Path) -> list:
-    """Load CSV data into list of dictionaries"""
+from io_utils import write_atomic, write_text_atomic
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Columns of modexp_analysis_data.csv the report reads, with fixed dtypes so pandas skips inference
+MAIN_DTYPES = {
+    "Bsize": "int32",
+    "Esize": "int32",
+    "Msize": "int32",
+    "gas_costs": "int64",
+    "cost_increase": "int64",
+}
+
+# Projection shared by the readers of the main analysis data; only these column chunks are decoded
+REPORT_COLS = tuple(MAIN_DTYPES)
+
+# Rows decoded per chunk when streaming the main analysis data
+CHUNK_ROWS = 1_000_000
+
+# Summaries of unchanged analysis files are reused across runs from here
+CACHE_DIR = Path.home() / ".cache" / "eip7883"
+
+# Part of every cache key; bump it whenever a cached summary changes shape or values
+# (2: nearest-rank int(p * n) percentiles, no cost ratio percentiles)
+CACHE_VERSION = 2
+
+# Columns of the top_impacted_senders/contracts exports
+TOP_DTYPES = {
+    "from_address": "string",
+    "to_address": "string",
+    "total_increase": "float64",
+    "avg_increase": "float64",
+    "call_count": "int64",
+    "unique_users": "int64",
+    "total_old_cost": "float64",
+    "total_new_cost": "float64",
+}
+
+
+def _empty_frame(dtypes: dict) -> pd.DataFrame:
+    """Zero-row frame with the given schema"""
+    return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in dtypes.items()})
+
+
+def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink integer columns to the narrowest dtype that holds their values (e.g. sizes to int16)"""
+    for col in df.select_dtypes(include="integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+
+def load_analysis_data(file_path: Path, dtypes: dict = MAIN_DTYPES) -> pd.DataFrame:
+    """Load the report columns of an analysis CSV with an explicit schema"""
     if not file_path.exists():
-        return []
+        return _empty_frame(dtypes)
+    
+    return _downcast(pd.read_csv(
+        file_path,
+        dtype=dtypes,
+        usecols=lambda col: col in dtypes,
+        engine="c",
+        low_memory=False,
+        memory_map=True
+    ))
+
+
+def _ensure_parquet(path_csv: Path) -> Optional[Path]:
+    """Parquet copy of an analysis CSV: the export's own parquet if present, else a report-only conversion"""
+    path_parquet = path_csv.with_suffix(".parquet")
+    if path_parquet.exists():
+        return path_parquet  # Written by run_analysis.py from the same frame; only ever read here
+    if not path_csv.exists():
+        return None
+    
+    # Converted under its own name so the export is never overwritten, and redone whenever the CSV changes
+    path_report = path_csv.with_suffix(".report.parquet")
+    if not path_report.exists() or path_report.stat().st_mtime_ns < path_csv.stat().st_mtime_ns:
+        # Convert only the report columns, in row groups the chunked reader can stream
+        with open(path_csv) as f:
+            header = f.readline().rstrip("\n").replace('"', "").split(",")
+        convert_options = pv.ConvertOptions(include_columns=[col for col in REPORT_COLS if col in header])
+        with pa.memory_map(str(path_csv)) as source:
+            table = pv.read_csv(source, convert_options=convert_options)
+        write_atomic(path_report, lambda target: pq.write_table(table, target, row_group_size=CHUNK_ROWS))
+    return path_report
+
+
+def iter_analysis_chunks(path_csv: Path, dtypes: dict = MAIN_DTYPES,
+                         chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Stream the report columns of an analysis table in bounded-size chunks"""
+    path_parquet = _ensure_parquet(path_csv)
+    if path_parquet is None:
+        return
     
-    with open(file_path, 'r') as f:
-        reader = csv.DictReader(f)
-        return list(reader)
+    # Decode only the columns the report uses
+    parquet_file = pq.ParquetFile(path_parquet, memory_map=True)
+    columns = [col for col in dtypes if col in parquet_file.schema_arrow.names]
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+        yield _downcast(batch.to_pandas().astype({col: dtypes[col] for col in columns}))
+
+
+# Summary lines the report reads, e.g. "  total_calls: 304301"
+_STAT_KEYS = (
+    "total_calls", "unique_transactions", "avg_cost_increase",
+    "median_cost_increase", "max_cost_increase", "total_cost_increase",
+    "calls_with_increase", "pct_calls_affected", "block_range"
+)
+_STAT_RE = re.compile(rf"^\s*({'|'.join(_STAT_KEYS)})\s*:\s*(\S.*?)\s*$", re.M)
+_NP_INT_RE = re.compile(r"np\.int64\((\d+)\)")
+_RANGE_TUPLE_RE = re.compile(r"\((\d+),\s*(\d+)\)")
+
+
+def _cast_stat(value: str):
+    """Summary values are ints unless they contain a decimal point"""
+    return float(value) if "." in value else int(value)
+
+
+_STAT_PARSERS = {"block_range": str}
 
 
 def parse_summary_file(file_path: Path) -> dict:
@@ -27,30 +151,13 @@ def parse_summary_file(file_path: Path) -> dict:
         return {}
     
     stats = {}
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
-    lines = content.split('\n')
-    for line in lines:
-        if ':' in line and any(key in line for key in [
-            'total_calls', 'unique_transactions', 'avg_cost_increase', 
-            'median_cost_increase', 'max_cost_increase', 'total_cost_increase',
-            'calls_with_increase', 'pct_calls_affected', 'block_range'
-        ]):
-            try:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                # Handle special cases
-                if 'block_range' in key:
-                    stats[key] = value
-                elif '.' in value:
-                    stats[key] = float(value)
-                else:
-                    stats[key] = int(value)
-            except:
-                continue
+    content = file_path.read_text()
+    for match in _STAT_RE.finditer(content):
+        key, value = match.groups()
+        try:
+            stats[key] = _STAT_PARSERS.get(key, _cast_stat)(value)
+        except ValueError:
+            continue
     
     return stats
 
@@ -62,26 +169,237 @@ def format_number(num):
     return str(num)
 
 
-def generate_comprehensive_report(analysis_dir: Path, output_file: str):
-    """Generate comprehensive markdown report from analysis outputs"""
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _kernel_usage(bsize, esize, msize, gas_costs, n_blocks):
+        """Fused size-pattern counters and gas range, reduced per block then combined"""
+        n = bsize.shape[0]
+        counts = np.zeros((n_blocks, 4), dtype=np.int64)
+        mins = np.empty(n_blocks, dtype=np.int64)
+        maxs = np.empty(n_blocks, dtype=np.int64)
+        for b in prange(n_blocks):
+            start = b * n // n_blocks
+            end = (b + 1) * n // n_blocks
+            lo = gas_costs[start]
+            hi = gas_costs[start]
+            for i in range(start, end):
+                if bsize[i] == 32 and esize[i] == 32 and msize[i] == 32:
+                    counts[b, 0] += 1
+                if bsize[i] > 32:
+                    counts[b, 1] += 1
+                if esize[i] > 32:
+                    counts[b, 2] += 1
+                if msize[i] > 32:
+                    counts[b, 3] += 1
+                lo = min(lo, gas_costs[i])
+                hi = max(hi, gas_costs[i])
+            mins[b] = lo
+            maxs[b] = hi
+        return counts.sum(axis=0), mins.min(), maxs.max()
+
+
+def analyze_modexp_usage(df: pd.DataFrame, use_numba: bool = False) -> dict:
+    """Count input-size patterns and the gas cost range in a single pass over the size block"""
+    if use_numba:
+        columns = [np.ascontiguousarray(df[col].to_numpy(), dtype=np.int64)
+                   for col in ("Bsize", "Esize", "Msize", "gas_costs")]
+        counts, min_cost, max_cost = _kernel_usage(*columns, max(1, min(len(df), 256)))
+        all_32_bytes, large_base, large_exp, large_mod = counts.tolist()
+    else:
+        sizes = df[["Bsize", "Esize", "Msize"]].to_numpy(dtype=np.int32, copy=False)
+        all_32_bytes = int(np.all(sizes == 32, axis=1).sum())
+        large_base, large_exp, large_mod = (sizes > 32).sum(axis=0).tolist()
+        gas_costs = df["gas_costs"].to_numpy(copy=False)
+        min_cost, max_cost = gas_costs.min(), gas_costs.max()
     
-    # Load data from analysis directory
-    summary_stats = parse_summary_file(analysis_dir / "analysis_summary.txt")
-    top_senders = load_csv_data(analysis_dir / "top_impacted_senders.csv")
-    top_contracts = load_csv_data(analysis_dir / "top_impacted_contracts.csv")
-    main_data = load_csv_data(analysis_dir / "modexp_analysis_data.csv")
+    return {
+        "total_calls": len(df),
+        "all_32_bytes": all_32_bytes,
+        "large_base": large_base,
+        "large_exp": large_exp,
+        "large_mod": large_mod,
+        "min_cost": int(min_cost),
+        "max_cost": int(max_cost),
+    }
+
+
+INCREASE_PROBS = [0.10, 0.25, 0.50, 0.75, 0.90, 0.95, 0.99]
+
+# Largest integer value span counted with np.bincount instead of a sort
+_BINCOUNT_LIMIT = 1 << 20
+
+
+def _percentile_keys(probs: list) -> list:
+    """Result keys such as p10/p99 for a list of probabilities"""
+    return [f"p{round(p * 100)}" for p in probs]
+
+
+def _rank_positions(probs: list, n: int) -> np.ndarray:
+    """Sorted-order indices int(p * n) of the report's nearest-rank percentiles"""
+    return (np.asarray(probs) * n).astype(np.int64)
+
+
+def _partition_quantiles(values: np.ndarray, probs: list) -> dict:
+    """Exact report percentiles of an unsorted array via one O(n) partition"""
+    positions = _rank_positions(probs, len(values))
+    return dict(zip(_percentile_keys(probs), np.partition(values, positions)[positions].tolist()))
+
+
+def _value_counts(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted distinct values and their counts, by bincount for compact non-negative integers"""
+    if values.dtype.kind in "iu" and len(values) and values.min() >= 0 and values.max() < _BINCOUNT_LIMIT:
+        counts = np.bincount(values)
+        present = np.flatnonzero(counts)
+        return present.astype(values.dtype), counts[present]
+    return np.unique(values, return_counts=True)
+
+
+def _histogram_quantiles(values: np.ndarray, counts: np.ndarray, probs: list) -> dict:
+    """Exact report percentiles of a distribution given as sorted distinct values and their counts"""
+    positions = _rank_positions(probs, counts.sum())
+    idx = np.searchsorted(np.cumsum(counts), positions, side="right")
+    return dict(zip(_percentile_keys(probs), values[idx].tolist()))
+
+
+def _merge_histograms(parts: list) -> Tuple[np.ndarray, np.ndarray]:
+    """Combine per-chunk (values, counts) pairs into one sorted histogram"""
+    values, inverse = np.unique(np.concatenate([v for v, _ in parts]), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate([c for _, c in parts])).astype(np.int64)
+    return values, counts
+
+
+class UsageAccumulator:
+    """Incremental usage counters and percentiles over chunks of the main analysis data"""
     
-    # Check if we have an existing analysis report to incorporate
-    existing_report = ""
-    report_files = list(analysis_dir.glob("*analysis_report.md"))
-    if report_files:
-        with open(report_files[0], 'r') as f:
-            existing_report = f.read()
+    def __init__(self, use_numba: bool = False):
+        self.use_numba = use_numba
+        self.usage = None
+        self.affected_calls = 0
+        self.increase_parts = []
+        
+    def update(self, chunk: pd.DataFrame):
+        """Fold one chunk into the running totals"""
+        if not len(chunk):
+            return
+        
+        usage = analyze_modexp_usage(chunk, self.use_numba)
+        if self.usage is None:
+            self.usage = usage
+        else:
+            for key in ("total_calls", "all_32_bytes", "large_base", "large_exp", "large_mod"):
+                self.usage[key] += usage[key]
+            self.usage["min_cost"] = min(self.usage["min_cost"], usage["min_cost"])
+            self.usage["max_cost"] = max(self.usage["max_cost"], usage["max_cost"])
+        
+        # Costs come from a small set of input shapes, so value counts keep exact percentiles compact
+        increases = chunk["cost_increase"].to_numpy()
+        affected = increases > 0
+        self.affected_calls += int(affected.sum())
+        self.increase_parts.append(_value_counts(increases[affected]))
+            
+    def finalize(self) -> Tuple[Optional[dict], dict]:
+        """Usage counters (None when no rows were seen) and cost percentiles"""
+        percentiles = {"affected_calls": self.affected_calls, "increase": {}}
+        if self.affected_calls:
+            percentiles["increase"] = _histogram_quantiles(*_merge_histograms(self.increase_parts), INCREASE_PROBS)
+        return self.usage, percentiles
+
+
+def calculate_percentiles(df: pd.DataFrame) -> dict:
+    """Cost increase percentiles over calls whose cost increases"""
+    increases = df["cost_increase"].to_numpy()
+    affected = increases > 0
+    percentiles = {"affected_calls": int(affected.sum()), "increase": {}}
+    if percentiles["affected_calls"]:
+        percentiles["increase"] = _partition_quantiles(increases[affected], INCREASE_PROBS)
+    return percentiles
+
+
+def disk_cache(func):
+    """Memoize a function of an analysis file path on disk, keyed by CACHE_VERSION and the path, mtime and size of its sources"""
+    @functools.wraps(func)
+    def wrapper(path_csv: Path, *args, **kwargs):
+        sources = [p for p in (path_csv, path_csv.with_suffix(".parquet")) if p.exists()]
+        if not sources:
+            return func(path_csv, *args, **kwargs)
+        
+        key = [CACHE_VERSION, func.__name__, args, sorted(kwargs.items())]
+        for source in sources:
+            stat = source.stat()
+            key.append((str(source.resolve()), stat.st_mtime_ns, stat.st_size))
+        cache_file = CACHE_DIR / f"{hashlib.sha1(repr(key).encode()).hexdigest()}.pkl"
+        
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+        
+        result = func(path_csv, *args, **kwargs)
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            write_atomic(cache_file, lambda target: target.write_bytes(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)))
+        except OSError as e:
+            print(f"WARNING: Could not write summary cache {cache_file}: {e}")
+        return result
+    
+    return wrapper
+
+
+@disk_cache
+def summarize_analysis_data(path_csv: Path, use_numba: bool = False) -> Tuple[Optional[dict], dict]:
+    """Usage counters and percentiles for the main analysis data, streamed chunk by chunk"""
+    accumulator = UsageAccumulator(use_numba)
+    for chunk in iter_analysis_chunks(path_csv):
+        accumulator.update(chunk)
+    return accumulator.finalize()
+
+
+def summarize_analysis_frame(df: pd.DataFrame, use_numba: bool = False,
+                             chunk_rows: int = CHUNK_ROWS) -> Tuple[Optional[dict], dict]:
+    """Usage counters and percentiles for an in-memory analysis table, cast chunk by chunk like the file path"""
+    columns = [col for col in MAIN_DTYPES if col in df.columns]
+    dtypes = {col: MAIN_DTYPES[col] for col in columns}
+    accumulator = UsageAccumulator(use_numba)
+    for start in range(0, len(df), chunk_rows):
+        # Slice rows before selecting columns so only the chunk is copied, not the whole table
+        chunk = df.iloc[start:start + chunk_rows][columns]
+        accumulator.update(_downcast(chunk.astype(dtypes)))
+    return accumulator.finalize()
+
+
+# Top-address table rows; numeric formatting lives in the format specs rather than per-cell calls, except the
+# average, which keeps format_number's whole-number/two-decimal switch
+SENDER_ROW = ("\n| {rank} | [{addr:.10}...](https://etherscan.io/address/{addr}) | {total_increase:,.0f} | "
+              "{avg_increase} | {call_count:,} | {total_old_cost:,.0f} | {total_new_cost:,.0f} |")
+CONTRACT_ROW = ("\n| {rank} | [{addr:.10}...](https://etherscan.io/address/{addr}) | {total_increase:,.0f} | "
+                "{avg_increase} | {call_count:,} | {unique_users:,} | {total_old_cost:,.0f} | {total_new_cost:,.0f} |")
+
+
+def _top_rows(df: pd.DataFrame, address_col: str, template: str) -> list:
+    """Markdown rows for the first ten entries of a top_impacted_* export"""
+    top = df.head(10)
+    missing = pd.Series(0, index=top.index)
+    
+    # Typed column arrays extracted once; a missing column renders as zero
+    columns = {"addr": top.get(address_col, pd.Series("N/A", index=top.index)).tolist()}
+    for col in ("total_increase", "avg_increase", "total_old_cost", "total_new_cost"):
+        columns[col] = top.get(col, missing).to_numpy(dtype=np.float64)
+    for col in ("call_count", "unique_users"):
+        columns[col] = top.get(col, missing).to_numpy(dtype=np.int64)
+    columns["avg_increase"] = [format_number(value) for value in columns["avg_increase"]]
     
-    # Start building the comprehensive report
-    report = f"""# EIP-7883 ModExp Analysis Report
+    return [
+        template.format_map({"rank": i + 1, **{col: values[i] for col, values in columns.items()}})
+        for i in range(len(top))
+    ]
+
+
+# Report skeleton, filled with str.format_map from one context dict per render. The
+# templates are parsed once at import; only the placeholders vary between runs.
+REPORT_HEADER = """# EIP-7883 ModExp Analysis Report
 
-*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*Generated on {generated_at}*
 
 ## Executive Summary
 
@@ -89,12 +407,12 @@ EIP-7883 impact analysis based on historical Ethereum mainnet data with statisti
 
 ### Key Findings
 
-- **Total ModExp calls analyzed**: {format_number(summary_stats.get('total_calls', 'N/A'))}
-- **Unique transactions**: {format_number(summary_stats.get('unique_transactions', 'N/A'))}
-- **Calls with cost increases**: {format_number(summary_stats.get('calls_with_increase', 'N/A'))} ({summary_stats.get('pct_calls_affected', 0):.1f}% of all calls)
-- **Total additional gas required**: {format_number(summary_stats.get('total_cost_increase', 'N/A'))} gas
-- **Average cost increase per affected call**: {format_number(summary_stats.get('avg_cost_increase', 0))} gas
-- **Maximum single call increase**: {format_number(summary_stats.get('max_cost_increase', 'N/A'))} gas
+- **Total ModExp calls analyzed**: {total_calls}
+- **Unique transactions**: {unique_transactions}
+- **Calls with cost increases**: {calls_with_increase} ({pct_calls_affected:.1f}% of all calls)
+- **Total additional gas required**: {total_cost_increase} gas
+- **Average cost increase per affected call**: {avg_cost_increase} gas
+- **Maximum single call increase**: {max_cost_increase} gas
 
 ## Entity Analysis
 
@@ -105,18 +423,7 @@ Addresses with highest total gas cost increases:
 | Rank | Address | Total Increase (gas) | Avg Increase | Call Count | Current Total Cost | New Total Cost |
 |------|---------|---------------------|--------------|------------|-------------------|----------------|"""
 
-    # Add top senders
-    for i, sender in enumerate(top_senders[:10], 1):
-        addr = sender.get('from_address', 'N/A')
-        total_inc = format_number(float(sender.get('total_increase', 0)))
-        avg_inc = format_number(float(sender.get('avg_increase', 0)))
-        call_count = format_number(int(sender.get('call_count', 0)))
-        old_cost = format_number(float(sender.get('total_old_cost', 0)))
-        new_cost = format_number(float(sender.get('total_new_cost', 0)))
-        
-        report += f"\n| {i} | [{addr[:10]}...](https://etherscan.io/address/{addr}) | {total_inc} | {avg_inc} | {call_count} | {old_cost} | {new_cost} |"
-
-    report += """
+CONTRACTS_HEADER = """
 
 ### Most Impacted Contracts
 
@@ -125,85 +432,38 @@ Contracts with highest total gas cost increases:
 | Rank | Contract Address | Total Increase (gas) | Avg Increase | Call Count | Unique Users | Current Total Cost | New Total Cost |
 |------|------------------|---------------------|--------------|------------|--------------|-------------------|----------------|"""
 
-    # Add top contracts  
-    for i, contract in enumerate(top_contracts[:10], 1):
-        addr = contract.get('to_address', 'N/A')
-        total_inc = format_number(float(contract.get('total_increase', 0)))
-        avg_inc = format_number(float(contract.get('avg_increase', 0)))
-        call_count = format_number(int(contract.get('call_count', 0)))
-        unique_users = format_number(int(contract.get('unique_users', 0)))
-        old_cost = format_number(float(contract.get('total_old_cost', 0)))
-        new_cost = format_number(float(contract.get('total_new_cost', 0)))
-        
-        report += f"\n| {i} | [{addr[:10]}...](https://etherscan.io/address/{addr}) | {total_inc} | {avg_inc} | {call_count} | {unique_users} | {old_cost} | {new_cost} |"
-
-    # Add usage analysis if we have main data
-    if main_data:
-        total_calls = len(main_data)
-        
-        # Calculate usage patterns
-        all_32_bytes = sum(1 for row in main_data if 
-                          int(row.get('Bsize', 0)) == 32 and 
-                          int(row.get('Esize', 0)) == 32 and 
-                          int(row.get('Msize', 0)) == 32)
-        large_exp = sum(1 for row in main_data if int(row.get('Esize', 0)) > 32)
-        large_mod = sum(1 for row in main_data if int(row.get('Msize', 0)) > 32)
-        large_base = sum(1 for row in main_data if int(row.get('Bsize', 0)) > 32)
-        
-        # Calculate cost patterns
-        gas_costs = [int(row.get('gas_costs', 0)) for row in main_data]
-        min_cost = min(gas_costs) if gas_costs else 0
-        max_cost = max(gas_costs) if gas_costs else 0
-        
-        # Calculate cost increases
-        increases = [float(row.get('cost_increase', 0)) for row in main_data if float(row.get('cost_increase', 0)) > 0]
-        
-        report += f"""
+USAGE_SECTION = """
 
 ## Usage Patterns
 
 ### Distribution
 
-- **Standard 32-byte inputs**: {format_number(all_32_bytes)} calls ({100*all_32_bytes/total_calls:.1f}%)
-- **Large exponents (>32 bytes)**: {format_number(large_exp)} calls  
-- **Large modulus (>32 bytes)**: {format_number(large_mod)} calls
-- **Large base (>32 bytes)**: {format_number(large_base)} calls
+- **Standard 32-byte inputs**: {all_32_bytes} calls ({pct_all_32_bytes:.1f}%)
+- **Large exponents (>32 bytes)**: {large_exp} calls  
+- **Large modulus (>32 bytes)**: {large_mod} calls
+- **Large base (>32 bytes)**: {large_base} calls
 
 ### Gas Costs
 
-- **Range**: {format_number(min_cost)} to {format_number(max_cost)} gas
-- **Total calls**: {format_number(total_calls)}
+- **Range**: {min_cost} to {max_cost} gas
+- **Total calls**: {total_calls}
 
 ### Cost Increases
 
-For {format_number(len(increases))} affected calls:"""
-
-        if increases:
-            increases.sort()
-            n = len(increases)
-            percentiles = {
-                10: increases[int(0.1 * n)],
-                25: increases[int(0.25 * n)], 
-                50: increases[int(0.5 * n)],
-                75: increases[int(0.75 * n)],
-                90: increases[int(0.9 * n)],
-                95: increases[int(0.95 * n)],
-                99: increases[int(0.99 * n)]
-            }
-            
-            report += f"""
+For {affected_calls} affected calls:"""
+
+INCREASE_SECTION = """
 
 **Increase percentiles:**
-- 10th percentile: {format_number(percentiles[10])} gas
-- 25th percentile: {format_number(percentiles[25])} gas  
-- 50th percentile (median): {format_number(percentiles[50])} gas
-- 75th percentile: {format_number(percentiles[75])} gas
-- 90th percentile: {format_number(percentiles[90])} gas
-- 95th percentile: {format_number(percentiles[95])} gas
-- 99th percentile: {format_number(percentiles[99])} gas"""
+- 10th percentile: {p10} gas
+- 25th percentile: {p25} gas  
+- 50th percentile (median): {p50} gas
+- 75th percentile: {p75} gas
+- 90th percentile: {p90} gas
+- 95th percentile: {p95} gas
+- 99th percentile: {p99} gas"""
 
-    # Add visualizations section
-    report += """
+REPORT_FOOTER = """
 
 ## Visualizations and Charts
 
@@ -243,36 +503,11 @@ Cost increases driven by:
 
 ## Analysis Methodology
 
-### Data Scope"""
-
-    # Add block range info with enhanced formatting
-    block_range = summary_stats.get('block_range', 'N/A')
-    block_range_display = block_range
-    block_span = "Unknown"
-    
-    if isinstance(block_range, str) and 'np.int64' in block_range:
-        import re
-        matches = re.findall(r'np\.int64\((\d+)\)', block_range)
-        if len(matches) == 2:
-            start_block = int(matches[0])
-            end_block = int(matches[1])
-            block_span = f"{end_block - start_block + 1:,} blocks"
-            block_range_display = f"{start_block:,} to {end_block:,}"
-    elif isinstance(block_range, str) and '(' in block_range:
-        # Handle tuple format like "(21659928, 22785670)"
-        import re
-        matches = re.findall(r'\((\d+),\s*(\d+)\)', block_range)
-        if matches:
-            start_block = int(matches[0][0])
-            end_block = int(matches[0][1])
-            block_span = f"{end_block - start_block + 1:,} blocks"
-            block_range_display = f"{start_block:,} to {end_block:,}"
-
-    report += f"""
-- **Block range**: {block_range_display} ({block_span})
-- **Total calls analyzed**: {format_number(summary_stats.get('total_calls', 'N/A'))}
+### Data Scope
+- **Block range**: {block_range} ({block_span})
+- **Total calls analyzed**: {total_calls}
 - **Data source**: Ethereum mainnet ModExp precompile calls
-- **Analysis date**: {datetime.now().strftime('%Y-%m-%d')}
+- **Analysis date**: {analysis_date}
 
 ### Methods
 - Gas costs calculated using EIP-2565 and EIP-7883 formulas
@@ -284,7 +519,7 @@ Cost increases driven by:
 
 ### Impact Assessment
 
-1. **Limited scope**: Only {summary_stats.get('pct_calls_affected', 0):.1f}% of calls affected
+1. **Limited scope**: Only {pct_calls_affected:.1f}% of calls affected
 2. **Predictable costs**: Impact follows input size patterns
 3. **Entity concentration**: Impact focused on small number of addresses
 4. **Security improvement**: DoS protection with minimal legitimate impact
@@ -308,16 +543,84 @@ Cost increases driven by:
 
 ### Data Notes
 
-Analysis based on historical mainnet data ({format_number(summary_stats.get('total_calls', 'N/A'))} calls). ModExp precompile primarily used by cryptographic applications and ZK proof systems.
+Analysis based on historical mainnet data ({total_calls} calls). ModExp precompile primarily used by cryptographic applications and ZK proof systems.
 
 ---
 
 *Report generated using historical Ethereum mainnet data. Gas calculations verified against EIP-2565 and EIP-7883 specifications.*
 """
 
+
+def _block_range_display(block_range) -> Tuple[str, str]:
+    """Human-readable block range and span from the summary's block_range value"""
+    display, span = block_range, "Unknown"
+    if isinstance(block_range, str) and 'np.int64' in block_range:
+        matches = _NP_INT_RE.findall(block_range)
+        bounds = (int(matches[0]), int(matches[1])) if len(matches) == 2 else None
+    elif isinstance(block_range, str) and '(' in block_range:
+        # Handle tuple format like "(21659928, 22785670)"
+        matches = _RANGE_TUPLE_RE.findall(block_range)
+        bounds = (int(matches[0][0]), int(matches[0][1])) if matches else None
+    else:
+        bounds = None
+        
+    if bounds:
+        start_block, end_block = bounds
+        span = f"{end_block - start_block + 1:,} blocks"
+        display = f"{start_block:,} to {end_block:,}"
+    return display, span
+
+
+def generate_comprehensive_report(analysis_dir: Path, output_file: str, use_numba: bool = False,
+                                  df: Optional[pd.DataFrame] = None):
+    """Generate comprehensive markdown report from analysis outputs, or from an in-memory call table if given"""
+    if use_numba and not NUMBA_AVAILABLE:
+        print("WARNING: numba not available, falling back to NumPy usage statistics")
+    use_numba = use_numba and NUMBA_AVAILABLE
+    
+    # Load data from analysis directory
+    summary_stats = parse_summary_file(analysis_dir / "analysis_summary.txt")
+    top_senders = load_analysis_data(analysis_dir / "top_impacted_senders.csv", TOP_DTYPES)
+    top_contracts = load_analysis_data(analysis_dir / "top_impacted_contracts.csv", TOP_DTYPES)
+    if df is not None:
+        usage, percentiles = summarize_analysis_frame(df, use_numba)
+    else:
+        usage, percentiles = summarize_analysis_data(analysis_dir / "modexp_analysis_data.csv", use_numba)
+    
+    # Everything the templates substitute, formatted once
+    now = datetime.now()
+    block_range, block_span = _block_range_display(summary_stats.get('block_range', 'N/A'))
+    context = {
+        "generated_at": now.strftime('%Y-%m-%d %H:%M:%S'),
+        "analysis_date": now.strftime('%Y-%m-%d'),
+        "pct_calls_affected": summary_stats.get('pct_calls_affected', 0),
+        "avg_cost_increase": format_number(summary_stats.get('avg_cost_increase', 0)),
+        "block_range": block_range,
+        "block_span": block_span,
+    }
+    for key in ("total_calls", "unique_transactions", "calls_with_increase", "total_cost_increase", "max_cost_increase"):
+        context[key] = format_number(summary_stats.get(key, 'N/A'))
+    
+    parts = [REPORT_HEADER.format_map(context)]
+    parts.extend(_top_rows(top_senders, "from_address", SENDER_ROW))
+    parts.append(CONTRACTS_HEADER)
+    parts.extend(_top_rows(top_contracts, "to_address", CONTRACT_ROW))
+
+    # Add usage analysis if we have main data
+    if usage is not None:
+        usage_context = {key: format_number(value) for key, value in usage.items()}
+        usage_context["pct_all_32_bytes"] = 100 * usage["all_32_bytes"] / usage["total_calls"]
+        usage_context["affected_calls"] = format_number(percentiles["affected_calls"])
+        parts.append(USAGE_SECTION.format_map(usage_context))
+
+        if percentiles["affected_calls"]:
+            increase = {key: format_number(value) for key, value in percentiles["increase"].items()}
+            parts.append(INCREASE_SECTION.format_map(increase))
+
+    parts.append(REPORT_FOOTER.format_map(context))
+
     # Write the final report
-    with open(output_file, 'w') as f:
-        f.write(report)
+    write_text_atomic(output_file, "".join(parts))
     
     print(f"Comprehensive analysis report saved to {output_file}")
 
@@ -328,6 +631,8 @@ def main():
                        help="Directory containing analysis output files")
     parser.add_argument("--output", type=str, default="eip7883_comprehensive_analysis.md",
                        help="Output markdown file name")
+    parser.add_argument("--numba", action="store_true",
+                       help="Compute usage statistics with the compiled numba kernel")
     
     args = parser.parse_args()
     
@@ -337,7 +642,7 @@ def main():
         return
     
     print(f"Loading analysis data from {analysis_dir}")
-    generate_comprehensive_report(analysis_dir, args.output)
+    generate_comprehensive_report(analysis_dir, args.output, use_numba=args.numba)
 
 
 if __name__ == "__main__":
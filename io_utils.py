@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Atomic file writes shared by the analysis scripts; standard library only
+"""
+
+import os
+import threading
+from pathlib import Path
+
+
+def write_atomic(path, writer):
+    """Run writer(target) on a temporary sibling unique to this process and thread, fsync it, then rename it over path"""
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        writer(tmp)
+        with open(tmp, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def write_text_atomic(path, text: str):
+    """Write text with a single write, atomically replacing path"""
+    write_atomic(path, lambda target: target.write_bytes(text.encode("utf-8")))
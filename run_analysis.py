@@ -4,200 +4,318 @@ Main script to run EIP-7883 analysis optimized for large datasets
 
 Transaction Enrichment Strategies:
 - block_range: Query all transactions in block range, filter afterwards (fast for dense ModExp usage)
-- tx_hash: Query specific transaction hashes only (efficient for sparse ModExp usage)  
+- tx_hash: Query specific transaction hashes only (efficient for sparse ModExp usage)
 - hybrid: Automatically select best strategy based on transaction density (default)
 """
 
-import os
 import sys
 import argparse
+import functools
 from pathlib import Path
-import pandas as pd
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Optional
 
-from eip7883_analysis import ModExpDataAnalyzer
-from utils import enrich_with_transaction_data, analyze_gas_usage_patterns, identify_affected_protocols
+from io_utils import write_atomic
 
+# eip7883_analysis pulls in pandas, pyarrow and plotly; import it only once there is work to do
+if TYPE_CHECKING:
+    from eip7883_analysis import ModExpDataAnalyzer
 
-def main():
+# zstd packs the call table noticeably tighter than snappy and decodes faster on re-read;
+# 128k-row groups keep column chunks large enough for efficient streaming scans
+PARQUET_OPTIONS = {
+    "engine": "pyarrow",
+    "compression": "zstd",
+    "compression_level": 3,
+    "row_group_size": 128 * 1024,
+    "use_dictionary": True,
+    "data_page_size": 1 << 20,
+}
+
+
+def positive_int(value: str) -> int:
+    """argparse type for options that need an integer of at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options"""
     parser = argparse.ArgumentParser(description="Run comprehensive EIP-7883 ModExp analysis")
-    parser.add_argument("--data-dir", type=str, default="modexp/modexp", 
+    parser.add_argument("--data-dir", type=str, default="modexp/modexp",
                        help="Directory containing ModExp parquet files")
     parser.add_argument("--output-dir", type=str, default="analysis_output",
                        help="Output directory for results")
     parser.add_argument("--limit", type=int, help="Limit number of files to process")
     parser.add_argument("--batch-size", type=int, default=1000, help="Batch size for file processing")
-    parser.add_argument("--enrich-txs", action="store_true", 
+    parser.add_argument("--enrich-txs", action="store_true",
                        help="Enrich with transaction data from Xatu")
     parser.add_argument("--max-tx-blocks", type=int, default=10000, help="Max blocks for transaction enrichment")
     parser.add_argument("--tx-batch-size", type=int, default=50, help="Batch size for transaction queries")
-    parser.add_argument("--tx-strategy", type=str, default="hybrid", 
+    parser.add_argument("--tx-strategy", type=str, default="hybrid",
                        choices=["block_range", "tx_hash", "hybrid"],
                        help="Transaction enrichment strategy: block_range (fast for dense data), tx_hash (efficient for sparse data), hybrid (auto-select)")
+    parser.add_argument("--xatu-cache", type=str, nargs="?", const=".xatu_cache",
+                       help="Cache fetched transaction data as parquet in this directory (default: .xatu_cache)")
     parser.add_argument("--quick", action="store_true",
-                       help="Quick analysis with limited data")
-    
-    args = parser.parse_args()
-    
-    # Create output directory
-    output_path = Path(args.output_dir)
-    output_path.mkdir(exist_ok=True)
-    
-    print("=== EIP-7883 ModExp Analysis (Optimized for Large Datasets) ===\n")
-    
-    start_time = time.time()
-    
-    # Initialize analyzer
-    print(f"Loading data from: {args.data_dir}")
-    analyzer = ModExpDataAnalyzer(args.data_dir)
-    
-    # Load ModExp data
+                       help="Quick analysis with limited data and columns, skipping charts and the comprehensive report")
+    parser.add_argument("--emit-csv", action="store_true",
+                       help="Also write the call-level data and entity tables as CSV for external tools")
+    parser.add_argument("--numba", action="store_true",
+                       help="Compute gas costs and report statistics with the compiled numba kernels")
+    parser.add_argument("--viz-processes", type=int, default=1,
+                       help="Worker processes for rendering the HTML charts")
+    parser.add_argument("--top-n", type=positive_int,
+                       help="Keep only the N largest rows in top_impacted_addresses.csv")
+
+    return parser.parse_args(argv)
+
+
+def _load_and_analyze(analyzer: "ModExpDataAnalyzer", args: argparse.Namespace, timings: dict) -> dict:
+    """Load ModExp data, optionally enrich it with transactions, and run the impact analysis"""
     limit = 100 if args.quick else args.limit
+    columns = QUICK_COLUMNS if args.quick else None
     load_start = time.time()
-    df = analyzer.load_modexp_data(limit=limit, batch_size=args.batch_size)
-    load_time = time.time() - load_start
-    
-    print(f"\nData loaded in {load_time:.1f} seconds:")
+    df = analyzer.load_modexp_data(limit=limit, batch_size=args.batch_size, columns=columns)
+    timings["load"] = time.time() - load_start
+
+    blocks = df["block_number"].to_numpy()
+    print(f"\nData loaded in {timings['load']:.1f} seconds:")
     print(f"- Total calls: {len(df):,}")
     print(f"- Unique transactions: {df['tx_hash'].nunique():,}")
-    print(f"- Block range: {df['block_number'].min():,} to {df['block_number'].max():,}")
-    
+    print(f"- Block range: {blocks.min():,} to {blocks.max():,}")
+
     # Enrich with transaction data if requested
     if args.enrich_txs:
-        print(f"\nEnriching with transaction data (max {args.max_tx_blocks:,} blocks)...")
-        enrich_start = time.time()
-        try:
-            import pyxatu
-            xatu = pyxatu.PyXatu()
-            analyzer.df = enrich_with_transaction_data(
-                analyzer.df, 
-                xatu, 
-                batch_size=args.tx_batch_size,
-                max_blocks=args.max_tx_blocks,
-                strategy=args.tx_strategy
-            )
-            enrich_time = time.time() - enrich_start
-            print(f"Transaction data enrichment complete in {enrich_time:.1f} seconds")
-        except ImportError:
-            print("ERROR: pyxatu not available, skipping transaction enrichment")
-        except Exception as e:
-            print(f"Warning: Could not enrich with transaction data: {e}")
-    
+        _enrich(analyzer, args, timings)
+
     # Perform analysis
     print("\nPerforming impact analysis...")
     analysis_start = time.time()
     results = analyzer.analyze_impact()
-    analysis_time = time.time() - analysis_start
-    
-    print(f"\nAnalysis complete in {analysis_time:.1f} seconds:")
+    timings["analysis"] = time.time() - analysis_start
+
+    print(f"\nAnalysis complete in {timings['analysis']:.1f} seconds:")
     print(f"- Calls with cost increase: {results['calls_with_increase']:,} ({results['pct_calls_affected']:.1f}%)")
     print(f"- Average cost increase: {results['avg_cost_increase']:.1f} gas")
     print(f"- Total additional gas: {results['total_cost_increase']:,}")
-    
-    # Export results
-    print("\nExporting results...")
-    export_start = time.time()
-    
-    # Save compressed data for large datasets
-    analyzer.df.to_parquet(output_path / "modexp_analysis_data.parquet", compression="snappy")
-    
-    # Save CSV for smaller datasets
-    if len(analyzer.df) < 100000:
-        analyzer.df.to_csv(output_path / "modexp_analysis_data.csv", index=False)
-    
-    # Export summary
-    with open(output_path / "analysis_summary.txt", "w") as f:
-        f.write("EIP-7883 ModExp Analysis Summary\n")
-        f.write("=" * 40 + "\n\n")
-        f.write(f"Analysis completed: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Total processing time: {time.time() - start_time:.1f} seconds\n\n")
-        
-        f.write("Performance:\n")
-        f.write(f"  Data loading: {load_time:.1f}s\n")
-        if args.enrich_txs:
-            f.write(f"  Transaction enrichment: {enrich_time:.1f}s\n")
-        f.write(f"  Analysis: {analysis_time:.1f}s\n\n")
-        
-        f.write("Results:\n")
-        for key, value in results.items():
-            if key not in ["top_impacted_senders", "top_impacted_contracts", "usage_patterns", "cost_percentiles"]:
-                f.write(f"  {key}: {value}\n")
-    
+
+    return results
+
+
+def _enrich(analyzer: "ModExpDataAnalyzer", args: argparse.Namespace, timings: dict):
+    """Join Xatu transaction metadata onto the loaded calls"""
+    print(f"\nEnriching with transaction data (max {args.max_tx_blocks:,} blocks)...")
+    enrich_start = time.time()
+    try:
+        # utils pulls in pyxatu, which is only needed here, so --help and offline runs never import it;
+        # without an explicit client utils reuses its shared one
+        from utils import enrich_with_transaction_data
+        analyzer.df = enrich_with_transaction_data(
+            analyzer.df,
+            batch_size=args.tx_batch_size,
+            max_blocks=args.max_tx_blocks,
+            strategy=args.tx_strategy,
+            cache_dir=args.xatu_cache
+        )
+        analyzer.optimize_dtypes()
+        timings["enrich"] = time.time() - enrich_start
+        print(f"Transaction data enrichment complete in {timings['enrich']:.1f} seconds")
+    except ImportError:
+        print("ERROR: pyxatu not available, skipping transaction enrichment")
+    except Exception as e:
+        print(f"Warning: Could not enrich with transaction data: {e}")
+
+
+def write_csv(df, path: Path, index: bool = True):
+    """Write a frame as CSV with Arrow's multithreaded writer, which runs without the GIL"""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    if index:
+        df = df.reset_index()
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+
+
+def input_signature(args: argparse.Namespace) -> Optional[str]:
+    """Fingerprint of the input files, analysis code and options that determine the call-level export"""
+    # Xatu results are not captured by local file stats, so enriched runs are always rewritten
+    if args.enrich_txs:
+        return None
+
+    import hashlib
+    import json
+    import eip7883_analysis
+
+    signature = hashlib.blake2b(digest_size=16)
+    sources = sorted(Path(args.data_dir).glob("*.parquet")) + [Path(__file__), Path(eip7883_analysis.__file__)]
+    for path in sources:
+        stat = path.stat()
+        signature.update(f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    signature.update(json.dumps(vars(args), sort_keys=True).encode())
+    return signature.hexdigest()
+
+
+# Raw columns the impact analysis needs; --quick decodes only these and skips the large B/M operands
+QUICK_COLUMNS = ["tx_hash", "gas_costs", "Bsize", "Esize", "Msize", "E"]
+
+# Result entries that are tables rather than scalars, exported separately
+SUMMARY_EXCLUDED = frozenset({"top_impacted_senders", "top_impacted_contracts", "usage_patterns", "cost_percentiles"})
+
+
+def _summary_text(results: dict, timings: dict, start_time: float) -> str:
+    """Plain-text run summary"""
+    lines = [
+        "EIP-7883 ModExp Analysis Summary\n",
+        "=" * 40 + "\n\n",
+        f"Analysis completed: {time.strftime('%Y-%m-%d %H:%M:%S')}\n",
+        f"Total processing time: {time.time() - start_time:.1f} seconds\n\n",
+        "Performance:\n",
+        f"  Data loading: {timings['load']:.1f}s\n",
+    ]
+    if "enrich" in timings:
+        lines.append(f"  Transaction enrichment: {timings['enrich']:.1f}s\n")
+    lines.append(f"  Analysis: {timings['analysis']:.1f}s\n\n")
+
+    lines.append("Results:\n")
+    lines.extend(f"  {key}: {value}\n" for key, value in results.items() if key not in SUMMARY_EXCLUDED)
+    return "".join(lines)
+
+
+def _export(analyzer: "ModExpDataAnalyzer", results: dict, output_path: Path, timings: dict, start_time: float,
+            emit_csv: bool = False, top_n: Optional[int] = None, signature: Optional[str] = None) -> bool:
+    """Write the call-level data, run summary and top address tables; return whether the call-level data was rewritten"""
+    import numpy as np
+    import pandas as pd
+
+    # (label, path, writer); every writer fills a temporary path that is renamed over the target on success.
+    # A label of None means the file is listed later in the run summary
+    summary = _summary_text(results, timings, start_time)
+    writes = [(None, output_path / "analysis_summary.txt", lambda target: target.write_text(summary))]
+    data_writes = [
+        # Save compressed data for large datasets
+        (None, output_path / "modexp_analysis_data.parquet",
+         functools.partial(analyzer.df.to_parquet, **PARQUET_OPTIONS)),
+    ]
+
+    # Save a feather copy for smaller datasets; text CSV is slow to format and only written on request
+    if results["total_calls"] < 100000:
+        data_writes.append((None, output_path / "modexp_analysis_data.feather",
+                            functools.partial(analyzer.df.to_feather, compression="zstd")))
+    if emit_csv:
+        data_writes.append((None, output_path / "modexp_analysis_data.csv",
+                            functools.partial(write_csv, analyzer.df, index=False)))
+
+    # The call-level files are the bulk of the bytes written; keep them if they came from the same inputs
+    signature_path = output_path / "modexp_analysis_data.parquet.sig"
+    data_unchanged = (signature is not None and signature_path.exists() and signature_path.read_text() == signature
+                      and all(path.exists() for _, path, _ in data_writes))
+    if data_unchanged:
+        print("Call-level data unchanged since the last export, keeping existing files")
+    else:
+        signature_path.unlink(missing_ok=True)
+        writes.extend(data_writes)
+
     # Save entity analysis results if available
-    if "top_impacted_senders" in results and results["top_impacted_senders"] is not None:
-        results["top_impacted_senders"].to_csv(output_path / "top_impacted_senders.csv")
-        print(f"- top_impacted_senders.csv")
-        
-    if "top_impacted_contracts" in results and results["top_impacted_contracts"] is not None:
-        results["top_impacted_contracts"].to_csv(output_path / "top_impacted_contracts.csv")
-        print(f"- top_impacted_contracts.csv")
-    
+    for key in ["top_impacted_senders", "top_impacted_contracts"]:
+        if key in results and results[key] is not None:
+            writes.append((f"{key}.csv", output_path / f"{key}.csv", functools.partial(write_csv, results[key])))
+
     # Export top_impacted_addresses.csv (combination of senders and contracts)
     if "top_impacted_senders" in results and "top_impacted_contracts" in results:
-        # Combine senders and contracts for a unified top addresses view
-        senders_df = results["top_impacted_senders"].copy()
-        senders_df['address'] = senders_df.index
-        senders_df['type'] = 'sender'
-        
-        contracts_df = results["top_impacted_contracts"].copy() 
-        contracts_df['address'] = contracts_df.index
-        contracts_df['type'] = 'contract'
-        
-        # Combine and sort by total_increase
-        combined_df = pd.concat([
-            senders_df[['address', 'type', 'total_increase', 'avg_increase', 'call_count']],
-            contracts_df[['address', 'type', 'total_increase', 'avg_increase', 'call_count']]
-        ]).sort_values('total_increase', ascending=False)
-        
-        combined_df.to_csv(output_path / "top_impacted_addresses.csv", index=False)
-        print(f"- top_impacted_addresses.csv")
-    
-    # Perform enhanced entity analysis if transaction data available
+        # Stack the two tables column by column instead of copying and concatenating frames
+        senders = results["top_impacted_senders"]
+        contracts = results["top_impacted_contracts"]
+        total_increase = np.concatenate([senders['total_increase'].to_numpy(), contracts['total_increase'].to_numpy()])
+
+        # Order by total_increase descending; with a row budget below the row count only the top rows are fully sorted
+        if top_n is not None and top_n < len(total_increase):
+            order = np.argpartition(-total_increase, top_n)[:top_n]
+            order = order[np.argsort(-total_increase[order], kind='mergesort')]
+        else:
+            order = np.argsort(-total_increase, kind='mergesort')
+
+        type_codes = np.repeat(np.array([0, 1], dtype=np.int8), [len(senders), len(contracts)])
+        combined_df = pd.DataFrame({
+            'address': np.concatenate([senders.index.to_numpy(), contracts.index.to_numpy()])[order],
+            'type': pd.Categorical.from_codes(type_codes[order], categories=['sender', 'contract']),
+            'total_increase': total_increase[order],
+            **{col: np.concatenate([senders[col].to_numpy(), contracts[col].to_numpy()])[order]
+               for col in ['avg_increase', 'call_count']}
+        })
+
+        writes.append(("top_impacted_addresses.csv", output_path / "top_impacted_addresses.csv",
+                       functools.partial(write_csv, combined_df, index=False)))
+
+    # The parquet/CSV writers spend most of their time in C without the GIL, so overlap them
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {executor.submit(write_atomic, path, writer): label for label, path, writer in writes}
+        for future in as_completed(futures):
+            future.result()
+            if futures[future]:
+                print(f"- {futures[future]}")
+
+    if signature is not None:
+        write_atomic(signature_path, lambda target: target.write_text(signature))
+    return not data_unchanged
+
+
+def _entity_export(analyzer: "ModExpDataAnalyzer", output_path: Path, emit_csv: bool = False):
+    """Run the detailed entity analysis and write its tables, if transaction data is present"""
     try:
         entity_results = analyzer.analyze_entities()
         if entity_results:
             print("Enhanced entity analysis completed")
-            
-            # Save detailed entity analysis
+
+            # kind -> (table, CSV name)
+            tables = {}
             if "sender_analysis" in entity_results:
-                entity_results["sender_analysis"].to_csv(output_path / "detailed_sender_analysis.csv")
-                print(f"- detailed_sender_analysis.csv")
-                
+                tables["senders"] = (entity_results["sender_analysis"], "detailed_sender_analysis.csv")
             if "contract_analysis" in entity_results:
-                entity_results["contract_analysis"].to_csv(output_path / "detailed_contract_analysis.csv") 
-                print(f"- detailed_contract_analysis.csv")
-                
-            if "entity_patterns" in entity_results:
-                patterns = entity_results["entity_patterns"]
-                if "top_sender_contract_pairs" in patterns:
-                    patterns["top_sender_contract_pairs"].to_csv(output_path / "sender_contract_pairs.csv")
-                    print(f"- sender_contract_pairs.csv")
+                tables["contracts"] = (entity_results["contract_analysis"], "detailed_contract_analysis.csv")
+            if "top_sender_contract_pairs" in entity_results.get("entity_patterns", {}):
+                tables["pairs"] = (entity_results["entity_patterns"]["top_sender_contract_pairs"],
+                                   "sender_contract_pairs.csv")
+            if not tables:
+                return
+
+            # Save detailed entity analysis as one dataset partitioned by kind instead of many small files
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            combined = pa.concat_tables([
+                pa.Table.from_pandas(table.reset_index(), preserve_index=False)
+                .append_column("kind", pa.array([kind] * len(table), pa.string()))
+                for kind, (table, _) in tables.items()
+            ], promote_options="default")
+            pq.write_to_dataset(combined, root_path=output_path / "entities.parquet", partition_cols=["kind"],
+                                existing_data_behavior="delete_matching")
+            print(f"- entities.parquet (kind={'|'.join(tables)})")
+
+            if emit_csv:
+                for table, csv_name in tables.values():
+                    write_atomic(output_path / csv_name, functools.partial(write_csv, table))
+                    print(f"- {csv_name}")
     except Exception as e:
         print(f"Enhanced entity analysis failed: {e}")
-    
-    export_time = time.time() - export_start
-    total_time = time.time() - start_time
-    
-    print(f"Export completed in {export_time:.1f} seconds")
-    print(f"\nTotal analysis time: {total_time:.1f} seconds")
-    print(f"\nResults saved to {args.output_dir}/:")
-    print(f"- modexp_analysis_data.parquet (compressed)")
-    if len(analyzer.df) < 100000:
-        print(f"- modexp_analysis_data.csv (readable)")
-    print(f"- analysis_summary.txt (summary)")
-    
-    # Generate visualizations
+
+
+def _visualize(analyzer: "ModExpDataAnalyzer", args: argparse.Namespace):
+    """Write the interactive charts"""
     print("\nGenerating visualizations...")
     try:
         viz_start = time.time()
-        analyzer.create_visualizations(args.output_dir)
+        analyzer.create_visualizations(args.output_dir, processes=args.viz_processes)
         viz_time = time.time() - viz_start
         print(f"Visualizations completed in {viz_time:.1f} seconds")
         print(f"- Interactive charts saved to {args.output_dir}/")
     except Exception as e:
         print(f"Warning: Could not generate visualizations: {e}")
-    
-    # Generate markdown reports
+
+
+def _generate_reports(analyzer: "ModExpDataAnalyzer", output_path: Path, comprehensive: bool = True):
+    """Write the markdown reports"""
     print("\nGenerating markdown reports...")
     try:
         from eip7883_analysis import generate_report
@@ -206,22 +324,74 @@ def main():
         print(f"- eip7883_analysis_report.md (detailed markdown report)")
     except Exception as e:
         print(f"Warning: Could not generate detailed markdown report: {e}")
-    
-    # Generate comprehensive report if generate_markdown_report.py exists
+
+    if not comprehensive:
+        return
+
+    # Generate the comprehensive report in-process, reusing the call table already in memory
     try:
-        import subprocess
-        result = subprocess.run([
-            "python3", "generate_markdown_report.py", 
-            "--analysis-dir", args.output_dir,
-            "--output", "eip7883_comprehensive_analysis.md"
-        ], capture_output=True, text=True, cwd=".")
-        if result.returncode == 0:
-            print(f"- eip7883_comprehensive_analysis.md (comprehensive report with Etherscan links)")
-        else:
-            print(f"Warning: Could not generate comprehensive report: {result.stderr}")
+        from generate_markdown_report import generate_comprehensive_report
+        generate_comprehensive_report(output_path, "eip7883_comprehensive_analysis.md",
+                                      use_numba=analyzer.use_numba, df=analyzer.df)
+        print(f"- eip7883_comprehensive_analysis.md (comprehensive report with Etherscan links)")
     except Exception as e:
         print(f"Warning: Could not generate comprehensive report: {e}")
-    
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Create output directory
+    output_path = Path(args.output_dir)
+    output_path.mkdir(exist_ok=True)
+
+    print("=== EIP-7883 ModExp Analysis (Optimized for Large Datasets) ===\n")
+
+    start_time = time.time()
+    timings = {}
+
+    # Initialize analyzer
+    print(f"Loading data from: {args.data_dir}")
+    from eip7883_analysis import ModExpDataAnalyzer
+    analyzer = ModExpDataAnalyzer(args.data_dir, use_numba=args.numba)
+
+    results = _load_and_analyze(analyzer, args, timings)
+
+    # Quick runs skip everything that is not needed to see the headline numbers
+    emit_csv = args.emit_csv and not args.quick
+
+    # Exports, entity tables and charts only read the analyzed frame, so they run side by side;
+    # the markdown reports read the exported summary and tables and wait for them. Reports and
+    # charts share the analyzer's per-address aggregates, which it builds under its own lock
+    print("\nExporting results...")
+    export_start = time.time()
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        export_future = executor.submit(_export, analyzer, results, output_path, timings, start_time,
+                                        emit_csv, args.top_n, input_signature(args))
+        # Perform enhanced entity analysis if transaction data available
+        entity_future = executor.submit(_entity_export, analyzer, output_path, emit_csv)
+        viz_future = None if args.quick else executor.submit(_visualize, analyzer, args)
+
+        data_written = export_future.result()
+        entity_future.result()
+        export_time = time.time() - export_start
+        total_time = time.time() - start_time
+
+        print(f"Export completed in {export_time:.1f} seconds")
+        print(f"\nTotal analysis time: {total_time:.1f} seconds")
+        print(f"\nResults saved to {args.output_dir}/:")
+        # Call-level files kept from an earlier export with the same inputs are listed as such
+        unchanged = "" if data_written else ", unchanged"
+        print(f"- modexp_analysis_data.parquet (compressed{unchanged})")
+        if results["total_calls"] < 100000:
+            print(f"- modexp_analysis_data.feather (Arrow IPC{unchanged})")
+        if emit_csv:
+            print(f"- modexp_analysis_data.csv (readable{unchanged})")
+        print(f"- analysis_summary.txt (summary)")
+
+        _generate_reports(analyzer, output_path, comprehensive=not args.quick)
+        if viz_future is not None:
+            viz_future.result()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,44 +3,58 @@
 Utility functions for ModExp data processing
 """
 
+import hashlib
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
 from typing import List, Optional, Dict
 import concurrent.futures
+import contextlib
+import threading
 import pyxatu
 
+from io_utils import write_atomic
 
-def enrich_with_transaction_data(
-    modexp_df: pd.DataFrame,
-    xatu_client: Optional[pyxatu.PyXatu] = None,
-    batch_size: int = 1000,
-    max_blocks: Optional[int] = None
-) -> pd.DataFrame:
-    """Enrich ModExp data with transaction metadata from Xatu - optimized for efficiency"""
-    
-    if xatu_client is None:
-        xatu_client = pyxatu.PyXatu()
-        
-    # Get unique blocks and transactions with ModExp calls
-    modexp_blocks = sorted(modexp_df["block_number"].unique())
-    modexp_txs = set(modexp_df["tx_hash"].unique())
-    
-    print(f"ModExp data spans {len(modexp_blocks):,} unique blocks with {len(modexp_txs):,} unique transactions")
-    
-    # Limit block range if specified
-    if max_blocks and len(modexp_blocks) > max_blocks:
-        print(f"Limiting to {max_blocks:,} most recent blocks")
-        modexp_blocks = modexp_blocks[-max_blocks:]
-        
-    min_block = min(modexp_blocks)
-    max_block = max(modexp_blocks)
+
+class _XatuPool:
+    """Xatu clients kept between enrichments, handed to one worker thread at a time"""
     
-    print(f"Querying transaction data for blocks {min_block:,} to {max_block:,}")
-    print(f"Block range spans {max_block - min_block + 1:,} blocks ({len(modexp_blocks):,} with ModExp calls)")
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle: List[pyxatu.PyXatu] = []
     
-    # Use targeted query with transaction hash filter for efficiency
-    query_template = """
+    @contextlib.contextmanager
+    def client(self):
+        """Borrow an idle client, creating one if every client is in use"""
+        with self._lock:
+            xatu_client = self._idle.pop() if self._idle else None
+        if xatu_client is None:
+            xatu_client = pyxatu.PyXatu()
+        try:
+            yield xatu_client
+        finally:
+            with self._lock:
+                self._idle.append(xatu_client)
+
+
+# Clients are not shared between threads, so each concurrent query gets its own session
+_XATU_POOL = _XatuPool()
+
+
+def _execute_query(xatu_client: Optional[pyxatu.PyXatu], query: str, **kwargs) -> pd.DataFrame:
+    """Run a query on the caller's client, or on a pooled client owned by this thread for the call"""
+    if xatu_client is not None:
+        return xatu_client.execute_query(query, **kwargs)
+    with _XATU_POOL.client() as pooled_client:
+        return pooled_client.execute_query(query, **kwargs)
+
+
+# Transaction columns joined onto ModExp calls
+TX_COLUMNS = "block_number, tx_hash, from_address, to_address, value, gas_used, gas_price, transaction_type"
+
+TX_QUERY = """
     SELECT 
         block_number, 
         transaction_hash as tx_hash, 
@@ -54,103 +68,246 @@ def enrich_with_transaction_data(
     WHERE meta_network_name = 'mainnet' 
         AND block_number >= {} 
         AND block_number <= {}
-        AND transaction_hash IN ({})
     """
+
+# Column types for Xatu results, applied instead of relying on pandas inference; integers are nullable and
+# value is left as returned since wei amounts can exceed 64 bits
+TX_DTYPES = {
+    "block_number": "int64",
+    "tx_hash": "string[pyarrow]",
+    "from_address": "string[pyarrow]",
+    "to_address": "string[pyarrow]",
+    "gas_used": "UInt64",
+    "gas_price": "UInt64",
+    "transaction_type": "UInt8"
+}
+
+# Hybrid strategy fetches the whole block range once at least this fraction of blocks has ModExp calls
+DENSE_BLOCK_FRACTION = 0.25
+
+# Block range strategy splits the range into queries of at most this many blocks
+RANGE_CHUNK_BLOCKS = 10_000
+
+
+def _typed_table(result: pd.DataFrame) -> pa.Table:
+    """Cast matched Xatu rows to TX_DTYPES and hand them over to Arrow"""
+    result = result.astype({col: dtype for col, dtype in TX_DTYPES.items() if col in result.columns})
+    return pa.Table.from_pandas(result, preserve_index=False)
+
+
+def _query_block_chunk(xatu_client: Optional[pyxatu.PyXatu], min_block: int, max_block: int,
+                       modexp_txs: frozenset) -> List[pa.Table]:
+    """Fetch every transaction in one block chunk and keep the ModExp ones client-side"""
+    result = _execute_query(xatu_client, TX_QUERY.format(min_block, max_block), columns=TX_COLUMNS)
+    if len(result) == 0:
+        print(f"  Blocks {min_block:,}-{max_block:,}: no transactions found")
+        return []
+    
+    result = result[result["tx_hash"].isin(modexp_txs)]
+    print(f"  Blocks {min_block:,}-{max_block:,}: found {len(result)} matching transactions")
+    return [_typed_table(result)]
+
+
+def _query_block_range(xatu_client: Optional[pyxatu.PyXatu], modexp_blocks: List[int], modexp_txs: frozenset,
+                       max_workers: int = 8) -> List[pa.Table]:
+    """Fetch every transaction in the ModExp block range as concurrent fixed-size chunk queries"""
+    min_block, max_block = modexp_blocks[0], modexp_blocks[-1]
+    starts = np.arange(min_block, max_block + 1, RANGE_CHUNK_BLOCKS)
+    ends = np.minimum(starts + RANGE_CHUNK_BLOCKS - 1, max_block)
+    
+    # Chunks without a single ModExp block cannot contribute rows, so they are never queried
+    counts = np.searchsorted(modexp_blocks, ends, side="right") - np.searchsorted(modexp_blocks, starts)
+    chunks = [(int(lo), int(hi)) for lo, hi, n in zip(starts, ends, counts) if n > 0]
+    print(f"Querying all transactions in blocks {min_block:,} to {max_block:,} in {len(chunks):,} range queries "
+          f"of up to {RANGE_CHUNK_BLOCKS:,} blocks ({max_workers} concurrent)")
     
     tx_results = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_query_block_chunk, xatu_client, lo, hi, modexp_txs) for lo, hi in chunks]
+        for future in concurrent.futures.as_completed(futures):
+            tx_results.extend(future.result())
     
-    # Convert transaction hashes to list and batch them
-    modexp_tx_list = list(modexp_txs)
+    return tx_results
+
+
+def _query_tx_batch(xatu_client: Optional[pyxatu.PyXatu], batch_txs: List[str], min_block: int, max_block: int,
+                    batch_number: int) -> List[pd.DataFrame]:
+    """Fetch one batch of transactions by hash, splitting the batch when the request URL gets too long"""
+    query_template = TX_QUERY + """    AND transaction_hash IN ({})
+    """
+    tx_hash_list = "'" + "','".join(batch_txs) + "'"
+    query = query_template.format(min_block, max_block, tx_hash_list)
+    
+    try:
+        result = _execute_query(xatu_client, query, columns=TX_COLUMNS)
+    except Exception as e:
+        error_str = str(e).lower()
+        if "414" in error_str or "request-uri too large" in error_str or "url too long" in error_str:
+            # URL too long - split the batch and retry both halves
+            if len(batch_txs) > 1:
+                half = (len(batch_txs) + 1) // 2
+                print(f"  Batch {batch_number}: URL too long, retrying in batches of {half}...")
+                return (_query_tx_batch(xatu_client, batch_txs[:half], min_block, max_block, batch_number)
+                        + _query_tx_batch(xatu_client, batch_txs[half:], min_block, max_block, batch_number))
+            print(f"  Batch {batch_number}: cannot reduce batch size further, skipping this transaction")
+            return []
+        
+        print(f"Error querying transaction batch {batch_number}: {e}")
+        # Try fallback query for individual transactions in this batch
+        fallback_results = []
+        for tx in batch_txs:
+            try:
+                fallback_query = f"""
+                SELECT 
+                    block_number, 
+                    transaction_hash as tx_hash, 
+                    from_address, 
+                    to_address, 
+                    value, 
+                    gas_used, 
+                    gas_price, 
+                    transaction_type 
+                FROM canonical_execution_transaction
+                WHERE meta_network_name = 'mainnet' 
+                    AND transaction_hash = '{tx}'
+                """
+                result = _execute_query(xatu_client, fallback_query)
+                if len(result) > 0:
+                    fallback_results.append(result)
+            except Exception as e2:
+                print(f"  Fallback query failed for {tx[:10]}...: {e2}")
+        
+        if not fallback_results:
+            return []
+        combined_result = pd.concat(fallback_results, ignore_index=True)
+        print(f"  Batch {batch_number}: fallback queries found {len(combined_result)} transactions")
+        return [combined_result]
+    
+    if len(result) == 0:
+        print(f"  Batch {batch_number}: no transactions found")
+        return []
+    
+    # Ensure we only get the transactions we asked for
+    result = result[result["tx_hash"].isin(batch_txs)]
+    print(f"  Batch {batch_number}: found {len(result)} matching transactions")
+    return [result]
+
+
+def _query_tx_hashes(xatu_client: Optional[pyxatu.PyXatu], modexp_tx_list: List[str], min_block: int, max_block: int,
+                     batch_size: int, max_workers: int = 8) -> List[pa.Table]:
+    """Fetch transactions by hash in batches, keeping several batch queries in flight at once"""
     tx_batch_size = min(batch_size, 50)  # Start with conservative batch size
+    batches = [modexp_tx_list[i:i + tx_batch_size] for i in range(0, len(modexp_tx_list), tx_batch_size)]
     
-    print(f"Processing {len(modexp_tx_list):,} transactions in batches of {tx_batch_size}")
+    print(f"Processing {len(modexp_tx_list):,} transactions in {len(batches):,} batches of {tx_batch_size} "
+          f"({max_workers} concurrent)")
     
-    i = 0
-    while i < len(modexp_tx_list):
-        batch_txs = modexp_tx_list[i:i + tx_batch_size]
-        tx_hash_list = "'" + "','".join(batch_txs) + "'"
+    # Each query is network-bound, so overlap them and collect results as they arrive; each batch is
+    # moved into Arrow straight away so its DataFrame can be freed before the final concatenation
+    tx_results = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_query_tx_batch, xatu_client, batch_txs, min_block, max_block, batch_number)
+            for batch_number, batch_txs in enumerate(batches, start=1)
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            tx_results.extend(_typed_table(result) for result in future.result())
+    
+    return tx_results
+
+
+def _xatu_cache_path(cache_dir: str, min_block: int, max_block: int, modexp_txs: frozenset) -> Path:
+    """Cache file for one enrichment, keyed by query, network, pyxatu version, block range and transaction set"""
+    digest = hashlib.sha256()
+    for part in (TX_QUERY, TX_COLUMNS, getattr(pyxatu, "__version__", ""), f"{min_block}-{max_block}"):
+        digest.update(part.encode() + b"\0")
+    digest.update("\n".join(sorted(modexp_txs)).encode())
+    return Path(cache_dir) / f"{digest.hexdigest()[:16]}.parquet"
+
+
+def _write_xatu_cache(path: Path, table: pa.Table):
+    """Write fetched transactions to the cache atomically so readers never see a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, lambda target: pq.write_table(table, target, compression="zstd"))
+
+
+def enrich_with_transaction_data(
+    modexp_df: pd.DataFrame,
+    xatu_client: Optional[pyxatu.PyXatu] = None,
+    batch_size: int = 1000,
+    max_blocks: Optional[int] = None,
+    strategy: str = "hybrid",
+    max_workers: int = 8,
+    cache_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """Enrich ModExp data with transaction metadata from Xatu using a block_range, tx_hash or hybrid strategy"""
+    
+    # An explicit xatu_client is shared by all max_workers query threads and must tolerate concurrent
+    # execute_query calls; without one, each query borrows its own client from the module pool
+    
+    if strategy not in ("block_range", "tx_hash", "hybrid"):
+        raise ValueError(f"Unknown enrichment strategy: {strategy}")
+    
+    # Get unique blocks and transactions with ModExp calls
+    modexp_blocks = sorted(modexp_df["block_number"].unique())
+    modexp_txs = frozenset(modexp_df["tx_hash"].unique())
+    
+    print(f"ModExp data spans {len(modexp_blocks):,} unique blocks with {len(modexp_txs):,} unique transactions")
+    
+    # Limit block range if specified
+    if max_blocks and len(modexp_blocks) > max_blocks:
+        print(f"Limiting to {max_blocks:,} most recent blocks")
+        modexp_blocks = modexp_blocks[-max_blocks:]
         
-        print(f"Querying batch {i//tx_batch_size + 1}: {len(batch_txs)} transactions")
+    min_block = min(modexp_blocks)
+    max_block = max(modexp_blocks)
+    
+    print(f"Querying transaction data for blocks {min_block:,} to {max_block:,}")
+    print(f"Block range spans {max_block - min_block + 1:,} blocks ({len(modexp_blocks):,} with ModExp calls)")
+    
+    # Canonical history does not change, so an earlier fetch of the same range and transactions is reused
+    cache_path = _xatu_cache_path(cache_dir, min_block, max_block, modexp_txs) if cache_dir else None
+    if cache_path is not None and cache_path.exists():
+        print(f"Loading cached transaction data from {cache_path}")
+        tx_table = pq.read_table(cache_path)
+    else:
+        # Dense usage is cheapest as one range scan; sparse usage as targeted hash lookups
+        if strategy == "hybrid":
+            density = len(modexp_blocks) / (max_block - min_block + 1)
+            strategy = "block_range" if density >= DENSE_BLOCK_FRACTION else "tx_hash"
+            print(f"Hybrid strategy: {density:.1%} of blocks have ModExp calls, using {strategy}")
         
-        query = query_template.format(min_block, max_block, tx_hash_list)
+        if strategy == "block_range":
+            tx_results = _query_block_range(xatu_client, modexp_blocks, modexp_txs, max_workers)
+        else:
+            tx_results = _query_tx_hashes(xatu_client, list(modexp_txs), min_block, max_block, batch_size, max_workers)
         
-        try:
-            result = xatu_client.execute_query(
-                query,
-                columns="block_number, tx_hash, from_address, to_address, value, gas_used, gas_price, transaction_type"
-            )
-            
-            if len(result) > 0:
-                # Ensure we only get the transactions we asked for
-                result = result[result["tx_hash"].isin(batch_txs)]
-                tx_results.append(result)
-                print(f"  Found {len(result)} matching transactions")
-            else:
-                print(f"  No transactions found for this batch")
+        # One Arrow concatenation for all batches; empty fetches are never cached
+        tx_table = pa.concat_tables(tx_results, promote_options="default") if tx_results else None
+        tx_results.clear()
+        if cache_path is not None and tx_table is not None:
+            _write_xatu_cache(cache_path, tx_table)
             
-            # Move to next batch
-            i += tx_batch_size
-                
-        except Exception as e:
-            error_str = str(e).lower()
-            if "414" in error_str or "request-uri too large" in error_str or "url too long" in error_str:
-                # URL too long - reduce batch size and retry
-                if tx_batch_size > 1:
-                    tx_batch_size = max(1, tx_batch_size // 2)
-                    print(f"  URL too long, reducing batch size to {tx_batch_size} and retrying...")
-                    continue  # Retry same batch with smaller size
-                else:
-                    print(f"  Cannot reduce batch size further, skipping this transaction")
-                    i += 1
-            else:
-                print(f"Error querying transaction batch: {e}")
-                # Try fallback query for individual transactions in this batch
-                fallback_results = []
-                for tx in batch_txs:
-                    try:
-                        fallback_query = f"""
-                        SELECT 
-                            block_number, 
-                            transaction_hash as tx_hash, 
-                            from_address, 
-                            to_address, 
-                            value, 
-                            gas_used, 
-                            gas_price, 
-                            transaction_type 
-                        FROM canonical_execution_transaction
-                        WHERE meta_network_name = 'mainnet' 
-                            AND transaction_hash = '{tx}'
-                        """
-                        result = xatu_client.execute_query(fallback_query)
-                        if len(result) > 0:
-                            fallback_results.append(result)
-                    except Exception as e2:
-                        print(f"  Fallback query failed for {tx[:10]}...: {e2}")
-                
-                if fallback_results:
-                    combined_result = pd.concat(fallback_results, ignore_index=True)
-                    tx_results.append(combined_result)
-                    print(f"  Fallback queries found {len(combined_result)} transactions")
-                
-                # Move to next batch
-                i += tx_batch_size
-            
-    if tx_results:
-        tx_df = pd.concat(tx_results, ignore_index=True)
+    if tx_table is not None:
+        # self_destruct releases each Arrow column as pandas takes it over
+        tx_df = tx_table.to_pandas(split_blocks=True, self_destruct=True)
+        del tx_table
         
-        # Merge with ModExp data
-        enriched_df = pd.merge(
-            modexp_df,
-            tx_df,
-            how="left",
-            on=["block_number", "tx_hash"]
-        )
+        # tx_hash identifies a transaction, so a hash lookup per column replaces the two-key merge
+        tx_indexed = tx_df.drop_duplicates("tx_hash").set_index("tx_hash")
+        tx_hashes = modexp_df["tx_hash"]
+        enriched_df = modexp_df.assign(**{
+            col: tx_hashes.map(tx_indexed[col])
+            for col in tx_indexed.columns if col != "block_number"
+        })
         
-        # Calculate ETH costs
-        enriched_df["eth_cost_current"] = enriched_df["gas_costs"] * enriched_df["gas_price"] / 1e18
-        enriched_df["eth_cost_eip7883"] = enriched_df["eip7883_cost"] * enriched_df["gas_price"] / 1e18
-        enriched_df["eth_cost_increase"] = enriched_df["eth_cost_eip7883"] - enriched_df["eth_cost_current"]
+        # Calculate ETH costs from one gas price in ETH per gas; the difference reuses its buffer
+        gas_price_eth = enriched_df["gas_price"].to_numpy(dtype=np.float64, na_value=np.nan) / 1e18
+        eth_cost_current = enriched_df["gas_costs"].to_numpy() * gas_price_eth
+        eth_cost_eip7883 = enriched_df["eip7883_cost"].to_numpy() * gas_price_eth
+        enriched_df["eth_cost_current"] = eth_cost_current
+        enriched_df["eth_cost_eip7883"] = eth_cost_eip7883
+        enriched_df["eth_cost_increase"] = np.subtract(eth_cost_eip7883, eth_cost_current, out=gas_price_eth)
         
         missing = enriched_df["from_address"].isna().sum()
         if missing > 0:
@@ -162,52 +319,83 @@ def enrich_with_transaction_data(
         return modexp_df
 
 
+SIZE_COLUMNS = ["Bsize", "Esize", "Msize"]
+
+# Upper edges of the gas cost brackets, the last one open-ended
+COST_BRACKET_EDGES = np.array([500, 1000, 5000, 10000, 50000, 100000, np.inf])
+COST_BRACKET_LABELS = ["<500", "500-1k", "1k-5k", "5k-10k", "10k-50k", "50k-100k", ">100k"]
+
+
+def _downcast(df: pd.DataFrame, columns: List[str], downcast: str) -> pd.DataFrame:
+    """Copy the given numeric columns in the narrowest dtype that holds their values"""
+    return pd.DataFrame({col: pd.to_numeric(df[col], downcast=downcast) for col in columns}, index=df.index)
+
+
+def _group_sum(codes: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """Per-group sums via bincount, cast back to int64 for integer columns (exact below 2**53)"""
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    return sums.astype(np.int64) if values.dtype.kind in "iu" else sums
+
+
+# Common Fermat prime exponents 3, 5, 17, 257 and 65537 as hex digits without prefix or leading zeros
+FERMAT_EXPONENTS_HEX = ["3", "5", "11", "101", "10001"]
+
+
 def analyze_gas_usage_patterns(df: pd.DataFrame) -> Dict:
     """Analyze patterns in ModExp gas usage"""
     
     patterns = {}
     
-    # Common parameter combinations
-    param_combos = df.groupby(["Bsize", "Esize", "Msize"]).size().sort_values(ascending=False)
-    patterns["top_param_combos"] = param_combos.head(20)
+    # Sizes fit in a few bytes; narrow copies halve the memory traffic of the groupby and quantiles
+    sizes = _downcast(df, SIZE_COLUMNS, "unsigned")
+    
+    # Common parameter combinations: each (Bsize, Esize, Msize) triple packed into one int64 key that sorts
+    # like the triple, counted with a flat value_counts; sizes too large to pack use the MultiIndex groupby
+    size_values = sizes.to_numpy()
+    try:
+        dims = tuple(int(m) + 1 for m in size_values.max(axis=0))
+        keys = np.ravel_multi_index(tuple(size_values.T), dims)
+    except ValueError:
+        param_combos = sizes.groupby(SIZE_COLUMNS).size()
+    else:
+        counts = pd.Series(keys).value_counts(sort=False).sort_index()
+        param_combos = pd.Series(
+            counts.to_numpy(),
+            index=pd.MultiIndex.from_arrays(np.unravel_index(counts.index.to_numpy(), dims), names=SIZE_COLUMNS)
+        )
+    patterns["top_param_combos"] = param_combos.sort_values(ascending=False).head(20)
     
-    # Exponent analysis
-    df["exponent_int"] = df["E"].apply(lambda x: int(x, 16) if x else 0)
-    df["is_fermat"] = df["exponent_int"].isin([3, 5, 17, 257, 65537])  # Common Fermat primes
+    # Exponent analysis: compare canonical hex digits of each distinct exponent instead of parsing every row
+    codes, exponents = pd.factorize(df["E"])
+    digits = pd.Series(exponents).str.lower().str.removeprefix("0x").str.lstrip("0")
+    is_fermat = digits.isin(FERMAT_EXPONENTS_HEX).to_numpy()
+    df["is_fermat"] = np.where(codes >= 0, is_fermat[codes], False)
     
     patterns["fermat_usage"] = {
         "count": df["is_fermat"].sum(),
         "percentage": 100 * df["is_fermat"].sum() / len(df)
     }
     
-    # Size patterns
+    # Size patterns: one pass over the three size columns for every statistic
+    means = size_values.mean(axis=0)
+    medians = np.median(size_values, axis=0)
+    p95s = np.quantile(size_values, 0.95, axis=0)
+    maxs = size_values.max(axis=0)
     patterns["size_stats"] = {
-        "base": {
-            "mean": df["Bsize"].mean(),
-            "median": df["Bsize"].median(),
-            "p95": df["Bsize"].quantile(0.95),
-            "max": df["Bsize"].max()
-        },
-        "exponent": {
-            "mean": df["Esize"].mean(),
-            "median": df["Esize"].median(),
-            "p95": df["Esize"].quantile(0.95),
-            "max": df["Esize"].max()
-        },
-        "modulus": {
-            "mean": df["Msize"].mean(),
-            "median": df["Msize"].median(),
-            "p95": df["Msize"].quantile(0.95),
-            "max": df["Msize"].max()
-        }
+        name: {"mean": means[i], "median": medians[i], "p95": p95s[i], "max": maxs[i]}
+        for i, name in enumerate(["base", "exponent", "modulus"])
     }
     
-    # Cost patterns
-    patterns["cost_brackets"] = pd.cut(
-        df["gas_costs"],
-        bins=[0, 500, 1000, 5000, 10000, 50000, 100000, float('inf')],
-        labels=["<500", "500-1k", "1k-5k", "5k-10k", "10k-50k", "50k-100k", ">100k"]
-    ).value_counts()
+    # Cost patterns: right-closed brackets (0, 500], (500, 1k], ... located with one searchsorted pass;
+    # calls at or below 0 gas and missing costs fall outside every bracket
+    gas_costs = df["gas_costs"].to_numpy(dtype=np.float64, na_value=np.nan)
+    bracket = np.searchsorted(COST_BRACKET_EDGES, gas_costs, side="left")
+    bracket = bracket[(gas_costs > 0) & (bracket < len(COST_BRACKET_LABELS))]
+    patterns["cost_brackets"] = pd.Series(
+        np.bincount(bracket, minlength=len(COST_BRACKET_LABELS)),
+        index=pd.CategoricalIndex(COST_BRACKET_LABELS, categories=COST_BRACKET_LABELS, ordered=True, name="gas_costs"),
+        name="count"
+    ).sort_values(ascending=False)
     
     return patterns
 
@@ -218,18 +406,31 @@ def identify_affected_protocols(df: pd.DataFrame) -> pd.DataFrame:
     if "to_address" not in df.columns:
         return pd.DataFrame()
         
-    # Group by receiving contract
-    contract_impact = df.groupby("to_address").agg({
-        "cost_increase": ["sum", "mean", "count"],
-        "from_address": "nunique",
-        "gas_costs": "sum",
-        "eip7883_cost": "sum"
-    }).round(2)
-    
-    contract_impact.columns = [
-        "total_increase", "avg_increase", "call_count",
-        "unique_users", "total_current_cost", "total_new_cost"
-    ]
+    # Factorize both address columns once and reduce every metric with bincount over the contract codes;
+    # sorted codes keep the row order, and so the ties in the final sort, of a string groupby
+    to_codes, to_uniques = pd.factorize(df["to_address"], sort=True)
+    from_codes, from_uniques = pd.factorize(df["from_address"])
+    has_contract = to_codes >= 0  # Calls without a to_address are dropped, as groupby would
+    to_codes = to_codes[has_contract]
+    from_codes = from_codes[has_contract]
+    n_contracts = len(to_uniques)
+    
+    total_increase = _group_sum(to_codes, df["cost_increase"].to_numpy()[has_contract], n_contracts)
+    call_count = np.bincount(to_codes, minlength=n_contracts)
+    
+    # Unique users per contract: count distinct (contract, sender) pairs, ignoring missing senders
+    has_sender = from_codes >= 0
+    pairs = np.unique(to_codes[has_sender].astype(np.int64) * len(from_uniques) + from_codes[has_sender])
+    unique_users = np.bincount(pairs // len(from_uniques), minlength=n_contracts)
+    
+    contract_impact = pd.DataFrame({
+        "total_increase": total_increase,
+        "avg_increase": total_increase / call_count,
+        "call_count": call_count.astype(np.int64),
+        "unique_users": unique_users.astype(np.int64),
+        "total_current_cost": _group_sum(to_codes, df["gas_costs"].to_numpy()[has_contract], n_contracts),
+        "total_new_cost": _group_sum(to_codes, df["eip7883_cost"].to_numpy()[has_contract], n_contracts)
+    }, index=to_uniques.rename("to_address")).round(2)
     
     contract_impact["avg_cost_ratio"] = contract_impact["total_new_cost"] / contract_impact["total_current_cost"]
     
@@ -239,27 +440,34 @@ def identify_affected_protocols(df: pd.DataFrame) -> pd.DataFrame:
 def export_summary_stats(df: pd.DataFrame, output_file: str = "modexp_summary_stats.csv"):
     """Export summary statistics for further analysis"""
     
+    # Pull each column out once and reduce the raw arrays, reusing the shared intermediates
+    blocks = df["block_number"].to_numpy()
+    increases = df["cost_increase"].to_numpy()
+    increased = np.count_nonzero(increases > 0)
+    total_increase = increases.sum()
+    large_sizes = (df[SIZE_COLUMNS].to_numpy() > 32).sum(axis=0)
+    
     summary = {
         "Total Calls": len(df),
         "Unique Transactions": df["tx_hash"].nunique(),
-        "Block Range Start": df["block_number"].min(),
-        "Block Range End": df["block_number"].max(),
-        "Calls with Cost Increase": (df["cost_increase"] > 0).sum(),
-        "Percent Affected": 100 * (df["cost_increase"] > 0).sum() / len(df),
-        "Total Current Gas": df["gas_costs"].sum(),
-        "Total EIP-7883 Gas": df["eip7883_cost"].sum(),
-        "Total Gas Increase": df["cost_increase"].sum(),
-        "Average Cost Increase": df["cost_increase"].mean(),
-        "Median Cost Increase": df["cost_increase"].median(),
-        "Max Cost Increase": df["cost_increase"].max(),
-        "Calls with Base > 32": (df["Bsize"] > 32).sum(),
-        "Calls with Exp > 32": (df["Esize"] > 32).sum(),
-        "Calls with Mod > 32": (df["Msize"] > 32).sum()
+        "Block Range Start": blocks.min(),
+        "Block Range End": blocks.max(),
+        "Calls with Cost Increase": increased,
+        "Percent Affected": 100 * increased / len(df),
+        "Total Current Gas": df["gas_costs"].to_numpy().sum(),
+        "Total EIP-7883 Gas": df["eip7883_cost"].to_numpy().sum(),
+        "Total Gas Increase": total_increase,
+        "Average Cost Increase": total_increase / len(df),
+        "Median Cost Increase": np.median(increases),
+        "Max Cost Increase": increases.max(),
+        "Calls with Base > 32": large_sizes[0],
+        "Calls with Exp > 32": large_sizes[1],
+        "Calls with Mod > 32": large_sizes[2]
     }
     
     summary_df = pd.DataFrame([summary]).T
     summary_df.columns = ["Value"]
-    summary_df.to_csv(output_file)
+    write_atomic(output_file, summary_df.to_csv)
     
     print(f"Summary statistics exported to {output_file}")
     